@@ -0,0 +1,596 @@
+"""
+Generic data-driven sign animator.
+
+Replaces the per-letter ALPHABATES/<letter>.py scripts: every pose comes from
+pose_library.npz, the armature is set up once and all keyframes are written
+from data, so any number of signs can be animated in one Blender session.
+
+Usage:
+    blender -b final_hello.blend -P animator.py -- a.mp4 a
+    blender -b final_hello.blend -P animator.py -- abc.mp4 a b c   # back to back
+    blender -b final_hello.blend -P animator.py -- abc.mp4 a b c --sentence   # arm stays raised
+    blender -b final_hello.blend -P animator.py -- abc.mp4 a b c --easing smoothstep   # baked quaternions
+    blender -b final_hello.blend -P animator.py -- a.mp4 a --preview   # quick Workbench look
+    blender -b final_hello.blend -P animator.py -- a.mp4 a --profile thumbnail   # 270p, low-detail mesh
+    blender -b final_hello.blend -P animator.py -- a.mp4 a --timing conversational   # 31 frames, not 100
+    blender -b final_hello.blend -P animator.py -- a.mp4 a --rates 60,30,24   # 60fps/a.mp4, 30fps/, 24fps/
+    blender -b final_hello.blend -P animator.py -- --batch out/ a b c   # out/a.mp4, ...
+    blender -b final_hello.blend -P animator.py -- frames/ a b c --shard 1/2   # PNGs only
+
+The world background (bg_blender.png) lives in a packed world datablock,
+built once per session or saved into the blend file with --save-background
+(along with the decimated avatar meshes).
+
+Frames are rendered to a PNG sequence in <output>.frames/ and encoded with
+ffmpeg; static spans (e.g. the held pose) are rendered once and duplicated.
+Frames already on disk from an interrupted run of the same animation are
+skipped, and in --batch mode each clip encodes while the next sign renders.
+--direct renders straight to FFMPEG/MPEG4 like the original scripts, and
+--preview swaps the production profile (Eevee, full size, blend file frame
+rate, background image) for a Workbench render at half size and half the
+frame rate without the background. --profile thumbnail renders a quarter-size
+clip; small outputs swap in a decimated avatar mesh (mesh_lod.py), --lod
+picks the level by hand.
+"""
+import argparse
+import functools
+import hashlib
+import os
+import shutil
+import sys
+import time
+
+import bpy
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from image_sequence import (  # noqa: E402
+    encode_sequence, fingerprint, frame_path, frames_dir_for, is_complete_frame, link_duplicates,
+    missing_frames, prepare_frames_dir, select_frames, shard_range, static_spans,
+)
+from interpolation import EASINGS, dense_rotations, rotation_tracks  # noqa: E402
+from job_table import JobTable  # noqa: E402
+from keyframes import write_tracks  # noqa: E402
+from mesh_lod import build_lods, use_lod  # noqa: E402
+from pose_compiler import (  # noqa: E402
+    SIGN_FRAMES, TIMING_PROFILES, sentence_tracks, sequence_tracks, timing_profile,
+)
+from pose_library import BG_IMAGE, LIBRARY_PATH, load_library  # noqa: E402
+from render_profiles import (  # noqa: E402
+    DEFAULT_PROFILE, LOD_LEVELS, RENDER_PROFILES, clip_end, lod_for, output_height, parse_rates,
+    rate_frame_ends, rate_output, rate_plan, stepped_end,
+)
+
+ARMATURE_NAME = "SMPLX-female"
+
+# World holding the background image node tree, reused by every render
+BACKGROUND_WORLD = "SignBackground"
+
+# fps and fps_base of the loaded blend file, so configuring a profile twice
+# (render worker jobs, multi-rate renders) never compounds its frame step
+_blend_fps_base = None
+_blend_fps = None
+# Avatar mesh level set by the last configure_render
+_lod_level = None
+
+# Printed before / after each sign of a --batch run
+START_PREFIX = "🎬 Rendering "
+DONE_PREFIX = "✅ Rendered "
+
+
+def setup_armature(armature_name=ARMATURE_NAME):
+    obj = bpy.data.objects[armature_name]
+    obj.animation_data_clear()
+    bpy.context.view_layer.objects.active = obj
+    bpy.ops.object.mode_set(mode='POSE')
+    return obj
+
+
+def snapshot_pose(obj):
+    """Rotations of every pose bone, to undo a sign before keying the next one."""
+    return {
+        bone.name: (bone.rotation_mode, tuple(bone.rotation_euler), tuple(bone.rotation_quaternion))
+        for bone in obj.pose.bones
+    }
+
+
+def restore_pose(obj, snapshot):
+    obj.animation_data_clear()
+    for bone in obj.pose.bones:
+        rotation_mode, euler, quaternion = snapshot[bone.name]
+        bone.rotation_mode = rotation_mode
+        bone.rotation_euler = euler
+        bone.rotation_quaternion = quaternion
+
+
+def retime(tracks, step):
+    """Squeeze ``{bone: (frames, values)}`` so ``step`` old frames become one."""
+    first = SIGN_FRAMES[0]
+    return {bone: ((np.asarray(frames) - first) / step + first, values)
+            for bone, (frames, values) in tracks.items()}
+
+
+def animate(obj, lib, names, sentence=False, easing=None, step=1, timing=None):
+    """Key ``names`` on the timeline and return the last frame.
+
+    Each sign is a full rest-raise-hold-rest clip, back to back; with
+    ``sentence`` the arm stays raised and moves straight from one handshape
+    to the next, so a fingerspelled word takes well under half the frames.
+    ``timing`` names a pose_compiler.TIMING_PROFILES entry (raise, hold and
+    lower durations, fps). With ``easing`` every frame is baked as a
+    quaternion key by interpolation.dense_rotations instead of leaving
+    Blender to interpolate the euler keys. ``step`` > 1 plays the animation
+    in 1/step of the frames; below 1 it spreads it over more (higher rates).
+    A single standard-timed sign runs to the blend file's frame_end like the
+    gesture scripts (see render_profiles.clip_end).
+    """
+    timing = timing_profile(timing, sentence)
+    if easing:
+        frames, bones, quat = dense_rotations(lib, names, sentence, easing, timing=timing)
+        write_tracks(obj, retime(rotation_tracks(frames, bones, quat), step),
+                     "rotation_quaternion", 'QUATERNION')
+    elif sentence:
+        write_tracks(obj, retime(sentence_tracks(lib, names, timing), step))
+    else:
+        write_tracks(obj, retime(sequence_tracks(lib, names, timing), step))
+    if timing["fps"]:
+        bpy.context.scene.render.fps = timing["fps"]
+    frame_end = stepped_end(clip_end(len(names), sentence, timing), step)
+    bpy.context.scene.frame_start = SIGN_FRAMES[0]
+    bpy.context.scene.frame_end = frame_end
+    return frame_end
+
+
+def build_background_nodes(world, image):
+    """The original scripts' five-node background tree, on ``world``."""
+    world.use_nodes = True
+    nodes = world.node_tree.nodes
+    links = world.node_tree.links
+
+    # Clear existing nodes
+    for node in list(nodes):
+        nodes.remove(node)
+
+    # Create nodes
+    tex_image = nodes.new(type="ShaderNodeTexImage")
+    tex_image.image = image
+
+    bg_node = nodes.new(type="ShaderNodeBackground")
+    output = nodes.new(type="ShaderNodeOutputWorld")
+
+    tex_coord = nodes.new(type="ShaderNodeTexCoord")
+    mapping = nodes.new(type="ShaderNodeMapping")
+
+    # Link nodes
+    links.new(tex_coord.outputs["Window"], mapping.inputs["Vector"])
+    links.new(mapping.outputs["Vector"], tex_image.inputs["Vector"])
+    links.new(tex_image.outputs["Color"], bg_node.inputs["Color"])
+    links.new(bg_node.outputs["Background"], output.inputs["Surface"])
+
+    # Set mapping to avoid stretching
+    mapping.inputs['Scale'].default_value = (1, 1, 1)
+
+
+def image_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def background_world(img_path=BG_IMAGE):
+    """The BACKGROUND_WORLD datablock showing ``img_path``, built only when needed.
+
+    The image is packed into the world's blend data, so once the world exists
+    (in this session, or saved into the blend file with --save-background)
+    renders neither rebuild the node tree nor read the image from this
+    host's path. It is rebuilt when the image on disk no longer matches the
+    packed one.
+    """
+    world = bpy.data.worlds.get(BACKGROUND_WORLD)
+    digest = image_digest(img_path) if os.path.exists(img_path) else None
+    if world is not None and (digest is None or world.get("background_sha256") == digest):
+        return world
+    if digest is None:
+        raise FileNotFoundError(f"background image {img_path} not found and {BACKGROUND_WORLD} not in blend file")
+
+    image = bpy.data.images.load(img_path, check_existing=True)
+    if world is not None:
+        # Stale: the already-loaded (packed) image no longer matches the file
+        if image.packed_file:
+            image.unpack(method='REMOVE')
+        image.reload()
+    if not image.packed_file:
+        image.pack()
+    world = world or bpy.data.worlds.new(BACKGROUND_WORLD)
+    world.use_fake_user = True
+    build_background_nodes(world, image)
+    world["background_sha256"] = digest
+    return world
+
+
+def set_world_background(img_path=BG_IMAGE):
+    bpy.context.scene.world = background_world(img_path)
+
+
+def save_background(img_path=BG_IMAGE):
+    """Build the background world and the decimated avatar meshes into the open blend file and save it."""
+    set_world_background(img_path)
+    build_lods(bpy.data.objects[ARMATURE_NAME])
+    bpy.ops.wm.save_mainfile()
+    print(f"✅ Saved {BACKGROUND_WORLD} and the avatar LOD meshes into {bpy.data.filepath}")
+
+
+def blend_fps():
+    """Frame rate the loaded blend file (and so every keyed frame number) uses."""
+    render = bpy.context.scene.render
+    fps = _blend_fps if _blend_fps is not None else render.fps
+    fps_base = _blend_fps_base if _blend_fps_base is not None else render.fps_base
+    return fps / fps_base
+
+
+def configure_render(output_path, direct=False, profile=RENDER_PROFILES[DEFAULT_PROFILE]):
+    global _blend_fps_base, _blend_fps, _lod_level
+    scene = bpy.context.scene
+    if _blend_fps_base is None:
+        _blend_fps_base, _blend_fps = scene.render.fps_base, scene.render.fps
+    scene.render.engine = profile["engine"]
+    scene.render.resolution_percentage = profile["resolution_percentage"]
+    level = lod_for(profile, scene.render.resolution_y)
+    if level != _lod_level:
+        _lod_level = use_lod(bpy.data.objects[ARMATURE_NAME], level)
+        print(f"🔻 Avatar LOD {level} for "
+              f"{output_height(scene.render.resolution_y, profile['resolution_percentage'])}p output")
+    scene.render.fps_base = _blend_fps_base * profile["frame_step"]
+    if profile["engine"] == 'BLENDER_WORKBENCH':
+        scene.display.shading.light = 'STUDIO'
+        scene.display.shading.color_type = 'MATERIAL'
+        scene.display.render_aa = 'FXAA'
+    if direct:
+        bpy.context.scene.render.image_settings.file_format = 'FFMPEG'
+        bpy.context.scene.render.ffmpeg.format = 'MPEG4'
+    else:
+        # Lossless frames, encoded by image_sequence.encode_sequence
+        bpy.context.scene.render.image_settings.file_format = 'PNG'
+        bpy.context.scene.render.image_settings.color_mode = 'RGB'
+    bpy.context.scene.render.filepath = output_path
+
+
+def animated_fcurves(scene):
+    """Every fcurve in the scene that can change what a rendered frame looks like."""
+    owners = [scene, scene.world, scene.world and scene.world.node_tree]
+    for ob in scene.objects:
+        owners += [ob, ob.data, getattr(ob.data, "shape_keys", None)]
+        for slot in ob.material_slots:
+            if slot.material:
+                owners += [slot.material, slot.material.node_tree]
+
+    fcurves = []
+    seen = set()
+    for owner in owners:
+        anim = getattr(owner, "animation_data", None)
+        if anim and anim.action and anim.action.name not in seen:
+            seen.add(anim.action.name)
+            fcurves.extend(anim.action.fcurves)
+    return fcurves
+
+
+def channel_values(scene, frames):
+    """``(frames, channels)`` values of every animated channel."""
+    fcurves = animated_fcurves(scene)
+    values = [[fc.evaluate(f) for fc in fcurves] for f in frames]
+    return np.array(values, dtype=np.float64).reshape(len(frames), len(fcurves))
+
+
+def render_settings(scene):
+    """Settings that change rendered pixels, part of a frame directory's fingerprint."""
+    render = scene.render
+    blend_path = bpy.data.filepath
+    return {
+        "blend": blend_path,
+        "blend_mtime": os.path.getmtime(blend_path) if blend_path else None,
+        "engine": render.engine,
+        "resolution": [render.resolution_x, render.resolution_y, render.resolution_percentage],
+        "fps": [render.fps, render.fps_base],
+        "film_transparent": render.film_transparent,
+        "lod": _lod_level,
+    }
+
+
+def scene_fps(scene):
+    return scene.render.fps / scene.render.fps_base
+
+
+def render_sequence(frames_dir, first=None, last=None, checkpoint=None):
+    """Render frames ``first..last`` (default: the scene range) as PNGs into ``frames_dir``.
+
+    Each static span is rendered once and hard-linked across the span. Frames
+    left complete by an interrupted run of the same animation are kept.
+    ``checkpoint(frame)`` is called after each span with the last frame done
+    and returns the range's last frame, which may have moved down meanwhile
+    (main.py --schedule hands the rest of the range to an idle worker).
+    """
+    scene = bpy.context.scene
+    render = scene.render
+    values = channel_values(scene, range(scene.frame_start, scene.frame_end + 1))
+    prepare_frames_dir(frames_dir, scene_fps(scene), scene.frame_start, scene.frame_end,
+                       fingerprint(values, render_settings(scene)))
+
+    first = scene.frame_start if first is None else first
+    last = scene.frame_end if last is None else last
+    frames = range(first, last + 1)
+    if render.use_motion_blur:
+        # Motion blur samples neighbouring frames, so no two frames match
+        spans = [(f, f) for f in frames]
+    else:
+        spans = static_spans(values[first - scene.frame_start:last - scene.frame_start + 1], first)
+
+    rendered = 0
+    for span_first, span_last in spans:
+        if span_first > last:
+            break
+        span_last = min(span_last, last)
+        path = frame_path(frames_dir, span_first)
+        if is_complete_frame(path):
+            if missing_frames(frames_dir, span_first, span_last):
+                link_duplicates(frames_dir, span_first, span_last)
+        else:
+            if os.path.exists(path):
+                # Truncated by a crash; unlink so the fresh render gets its own inode
+                os.remove(path)
+            scene.frame_set(span_first)
+            render.filepath = path
+            bpy.ops.render.render(write_still=True)
+            link_duplicates(frames_dir, span_first, span_last)
+            rendered += 1
+        if checkpoint:
+            last = checkpoint(span_last)
+    print(f"🧊 frames {first}-{last}: {last - first + 1} frames, {len(spans)} spans, {rendered} rendered")
+
+
+def render_deduplicated(output_path):
+    """Render the scene range via a PNG sequence and encode it to ``output_path``."""
+    scene = bpy.context.scene
+    frames_dir = frames_dir_for(output_path)
+    render_sequence(frames_dir)
+    encode_sequence(frames_dir, output_path, scene_fps(scene), scene.frame_start,
+                    threads=scene.render.threads)
+    shutil.rmtree(frames_dir, ignore_errors=True)
+
+
+def render_clip(output_path, direct=False):
+    if direct:
+        bpy.context.scene.render.filepath = output_path
+        bpy.ops.render.render(animation=True)
+    else:
+        render_deduplicated(output_path)
+
+
+def check_signs(lib, names):
+    missing = [name for name in names if name not in lib]
+    if missing:
+        raise KeyError(f"Signs not in pose library: {', '.join(missing)}")
+
+
+def render_signs(names, output_path, lib=None, direct=False, sentence=False, easing=None,
+                 profile=RENDER_PROFILES[DEFAULT_PROFILE], timing=None, rates=None):
+    lib = lib or load_library(LIBRARY_PATH)
+    check_signs(lib, names)
+
+    obj = setup_armature()
+    if rates:
+        configure_render(output_path, profile=profile)
+        if profile["background"]:
+            set_world_background(BG_IMAGE)
+        render_rates(obj, lib, names, output_path, rates, sentence, easing, timing)
+        return
+    animate(obj, lib, names, sentence, easing, profile["frame_step"], timing)
+    configure_render(output_path, direct, profile)
+    if profile["background"]:
+        set_world_background(BG_IMAGE)
+    render_clip(output_path, direct)
+
+
+def render_rates(obj, lib, names, output_path, rates, sentence=False, easing=None, timing=None,
+                 initial_pose=None):
+    """Render ``names`` once per rate_plan base rate and derive the rest by frame selection.
+
+    The animation is retimed for each rendered rate (so a 60 fps clip lasts
+    as long as the 24 fps one) and every rate goes to rate_output(). The
+    render profile's own frame step is replaced by the rates. Returns
+    ``{rate: path}``.
+    """
+    scene = bpy.context.scene
+    source_fps = timing_profile(timing, sentence)["fps"] or blend_fps()
+    source_end = clip_end(len(names), sentence, timing_profile(timing, sentence))
+    outputs = {}
+    for base, derived in rate_plan(rates):
+        if initial_pose is not None:
+            restore_pose(obj, initial_pose)
+        animate(obj, lib, names, sentence, easing, source_fps / base, timing)
+        # Past the base clip's own end when a derived rate's last instant falls there
+        scene.frame_end, ends = rate_frame_ends(source_end, source_fps, base, derived)
+        scene.render.fps, scene.render.fps_base = base, 1.0
+        base_path = rate_output(output_path, base)
+        os.makedirs(os.path.dirname(base_path), exist_ok=True)
+        frames_dir = frames_dir_for(base_path)
+        render_sequence(frames_dir)
+        encode_sequence(frames_dir, base_path, base, scene.frame_start, threads=scene.render.threads,
+                        frame_count=ends[base] - scene.frame_start + 1)
+        outputs[base] = base_path
+        for rate in derived:
+            path = rate_output(output_path, rate)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            selected_dir = frames_dir_for(path)
+            count = select_frames(frames_dir, selected_dir, scene.frame_start, ends[rate], base // rate)
+            encode_sequence(selected_dir, path, rate, scene.frame_start, threads=scene.render.threads)
+            shutil.rmtree(selected_dir, ignore_errors=True)
+            print(f"🎞️ {rate} fps: {count} frames selected from the {base} fps render")
+            outputs[rate] = path
+        shutil.rmtree(frames_dir, ignore_errors=True)
+    return outputs
+
+
+def render_shard(names, frames_dir, shard, shard_count, lib=None, sentence=False, easing=None,
+                 profile=RENDER_PROFILES[DEFAULT_PROFILE], timing=None, frames=None, job=None):
+    """Render shard ``shard`` of ``shard_count`` of the signs' frame range as PNGs.
+
+    Every shard keys the same animation, so the frames written by all shards
+    form one sequence that main.py encodes once. ``frames`` gives the range
+    as ``(first, last)`` instead; with ``job`` ``(table path, job id)`` the
+    range's progress goes to that job_table, which may shorten it.
+    """
+    lib = lib or load_library(LIBRARY_PATH)
+    check_signs(lib, names)
+
+    obj = setup_armature()
+    animate(obj, lib, names, sentence, easing, profile["frame_step"], timing)
+    configure_render(frames_dir, profile=profile)
+    if profile["background"]:
+        set_world_background(BG_IMAGE)
+    scene = bpy.context.scene
+    first, last = frames or shard_range(scene.frame_start, scene.frame_end, shard, shard_count)
+    checkpoint = None
+    if job:
+        table_path, job_id = job
+        checkpoint = functools.partial(JobTable(table_path).progress, job_id)
+        last = min(last, checkpoint(first - 1))
+    render_sequence(frames_dir, first, last, checkpoint)
+
+
+def parse_frames(value):
+    first, last = (int(v) for v in value.split("-"))
+    if first > last:
+        raise argparse.ArgumentTypeError(f"frame range must look like FIRST-LAST, got {value}")
+    return first, last
+
+
+def parse_shard(value):
+    shard, count = (int(v) for v in value.split("/"))
+    if not 1 <= shard <= count:
+        raise argparse.ArgumentTypeError(f"shard must look like 1/{count} .. {count}/{count}")
+    return shard, count
+
+
+def report_done(name, started):
+    # main.py reads these lines to track progress and resume failed batches
+    print(f"{DONE_PREFIX}{name} in {time.perf_counter() - started:.2f}s", flush=True)
+
+
+def finish_encodes(encoding, wait=False):
+    """Report signs whose background encode finished; return those still running."""
+    running = []
+    for name, started, frames_dir, proc in encoding:
+        if wait:
+            proc.wait()
+        if proc.poll() is None:
+            running.append((name, started, frames_dir, proc))
+            continue
+        if proc.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed for {name} (exit {proc.returncode}), frames kept in {frames_dir}")
+        shutil.rmtree(frames_dir, ignore_errors=True)
+        report_done(name, started)
+    return running
+
+
+def render_batch(names, output_dir, lib=None, direct=False, profile=RENDER_PROFILES[DEFAULT_PROFILE],
+                 timing=None, rates=None):
+    """Render each sign to ``<output_dir>/<sign>.mp4`` in this one Blender session.
+
+    The blend file, render settings and world background are set up once; per
+    sign only the animation is cleared, re-keyed and rendered. A sign's frames
+    are encoded by ffmpeg in the background while the next sign renders.
+    """
+    lib = lib or load_library(LIBRARY_PATH)
+    check_signs(lib, names)
+    os.makedirs(output_dir, exist_ok=True)
+
+    obj = setup_armature()
+    initial_pose = snapshot_pose(obj)
+    configure_render(output_dir, direct and not rates, profile)
+    if profile["background"]:
+        set_world_background(BG_IMAGE)
+
+    encoding = []
+    for name in names:
+        output_path = os.path.join(output_dir, f"{name}.mp4")
+        print(f"{START_PREFIX}{name} -> {output_path}", flush=True)
+        started = time.perf_counter()
+        if rates:
+            render_rates(obj, lib, [name], output_path, rates, timing=timing, initial_pose=initial_pose)
+            report_done(name, started)
+            continue
+        restore_pose(obj, initial_pose)
+        animate(obj, lib, [name], step=profile["frame_step"], timing=timing)
+        if direct:
+            render_clip(output_path, direct)
+            report_done(name, started)
+        else:
+            frames_dir = frames_dir_for(output_path)
+            render_sequence(frames_dir)
+            scene = bpy.context.scene
+            # Encoders share the render threads Blender got with -t, so a pool
+            # of batch workers never runs more threads than it was given
+            proc = encode_sequence(frames_dir, output_path, scene_fps(scene), scene.frame_start, wait=False,
+                                   threads=scene.render.threads)
+            encoding.append((name, started, frames_dir, proc))
+        encoding = finish_encodes(encoding)
+    finish_encodes(encoding, wait=True)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="blender -b final_hello.blend -P animator.py --")
+    parser.add_argument("output", nargs="?", help="output .mp4 (directory with --batch or --shard)")
+    parser.add_argument("signs", nargs="*", help="sign names from the pose library")
+    parser.add_argument("--batch", action="store_true",
+                        help="render every sign to its own <output>/<sign>.mp4")
+    parser.add_argument("--direct", action="store_true",
+                        help="render every frame straight to FFMPEG (no static-span reuse)")
+    parser.add_argument("--sentence", action="store_true",
+                        help="animate the signs as one word: no return to rest between signs")
+    parser.add_argument("--easing", choices=sorted(EASINGS),
+                        help="bake per-frame quaternion rotations with this easing between keys")
+    parser.add_argument("--preview", action="store_true",
+                        help="quick Workbench render: half size, half frame rate, no background")
+    parser.add_argument("--profile", choices=sorted(RENDER_PROFILES),
+                        help=f"render profile (default: {DEFAULT_PROFILE}, or preview with --preview)")
+    parser.add_argument("--lod", choices=list(LOD_LEVELS),
+                        help="avatar mesh detail (default: picked from the output height)")
+    parser.add_argument("--timing", choices=sorted(TIMING_PROFILES),
+                        help="sign timing profile (default: standard, or sentence with --sentence)")
+    parser.add_argument("--rates", type=parse_rates, metavar="FPS,FPS",
+                        help="write <dir>/<fps>fps/<name> for each rate; divisible rates reuse one render")
+    parser.add_argument("--shard", type=parse_shard, metavar="I/N",
+                        help="render only the I-th of N frame ranges as PNGs into <output>/")
+    parser.add_argument("--frames", type=parse_frames, metavar="FIRST-LAST",
+                        help="render only these frames as PNGs into <output>/")
+    parser.add_argument("--job", nargs=2, metavar=("TABLE", "ID"),
+                        help="with --frames, report progress to job ID of a main.py --schedule job table")
+    parser.add_argument("--save-background", action="store_true",
+                        help="pack the background world and the avatar LOD meshes into the blend file "
+                             "and save it, then exit")
+    args = parser.parse_args(argv)
+    if not args.save_background and not (args.output and args.signs):
+        parser.error("give an output and at least one sign")
+    if args.rates and args.direct:
+        parser.error("--rates selects frames from a PNG sequence, not --direct")
+    return args
+
+
+if __name__ == "__main__":
+    argv = sys.argv
+    argv = argv[argv.index("--") + 1:] if "--" in argv else []  # get args after '--'
+    args = parse_args(argv)
+    profile = RENDER_PROFILES[args.profile or ("preview" if args.preview else DEFAULT_PROFILE)]
+    if args.lod:
+        profile = dict(profile, lod=args.lod)
+    if args.save_background:
+        save_background()
+    elif args.shard or args.frames:
+        render_shard(args.signs, args.output, *(args.shard or (1, 1)), sentence=args.sentence,
+                     easing=args.easing, profile=profile, timing=args.timing, frames=args.frames,
+                     job=args.job and (args.job[0], int(args.job[1])))
+    elif args.batch:
+        render_batch(args.signs, args.output, direct=args.direct, profile=profile, timing=args.timing,
+                     rates=args.rates)
+    else:
+        render_signs(args.signs, args.output, direct=args.direct, sentence=args.sentence,
+                     easing=args.easing, profile=profile, timing=args.timing, rates=args.rates)
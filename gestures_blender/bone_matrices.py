@@ -0,0 +1,75 @@
+"""
+Per-frame bone matrices of every sign, stored for memory mapping (no bpy needed).
+
+export_matrices.py evaluates the SMPL-X armature in Blender once per frame and
+writes two files:
+
+    bone_matrices.npy    float32 (signs, frames, bones, 4, 4), world space
+    bone_matrices.json   index: signs, bones, frame numbers, fps, timing
+
+The array is a plain .npy, so readers map it and slice one sign or bone
+without reading the rest of the file:
+
+    store = BoneMatrices("bone_matrices.npy")
+    hello = store.sign("hello")                      # (frames, bones, 4, 4)
+    wrist = store.bone("right_wrist")                # (signs, frames, 4, 4)
+"""
+import json
+import os
+
+import numpy as np
+
+DTYPE = np.float32
+INDEX_SUFFIX = ".json"
+
+
+def index_path(path):
+    return os.path.splitext(path)[0] + INDEX_SUFFIX
+
+
+def create_matrices(path, signs, bones, frames):
+    """Allocate ``path`` on disk and return it as a writable (signs, frames, bones, 4, 4) memmap."""
+    shape = (len(signs), len(frames), len(bones), 4, 4)
+    return np.lib.format.open_memmap(path, mode="w+", dtype=DTYPE, shape=shape)
+
+
+def write_index(path, signs, bones, frames, fps=None, timing=None):
+    """Write the index next to ``path``; written last, so a finished export is one with an index."""
+    index = {
+        "signs": list(signs),
+        "bones": list(bones),
+        "frames": [int(frame) for frame in frames],
+        "fps": fps,
+        "timing": timing,
+        "space": "world",
+        "layout": "signs, frames, bones, 4, 4 (row-major matrices)",
+    }
+    with open(index_path(path), "w") as f:
+        json.dump(index, f, indent=1)
+    return index
+
+
+class BoneMatrices:
+    """An exported matrix file, memory-mapped read-only, with its index."""
+
+    def __init__(self, path):
+        with open(index_path(path)) as f:
+            self.index = json.load(f)
+        self.matrices = np.load(path, mmap_mode="r")
+        self.signs = self.index["signs"]
+        self.bones = self.index["bones"]
+        self.frames = np.asarray(self.index["frames"])
+        self._sign_rows = {name: i for i, name in enumerate(self.signs)}
+        self._bone_columns = {name: i for i, name in enumerate(self.bones)}
+
+    def sign(self, name):
+        """``(frames, bones, 4, 4)`` of one sign; only its pages are read."""
+        return self.matrices[self._sign_rows[name]]
+
+    def bone(self, name):
+        """``(signs, frames, 4, 4)`` of one bone across every sign."""
+        return self.matrices[:, :, self._bone_columns[name]]
+
+    def positions(self, name):
+        """World positions ``(frames, bones, 3)`` of one sign's bone heads."""
+        return np.asarray(self.sign(name)[..., :3, 3])
@@ -0,0 +1,113 @@
+"""
+Content-hash build cache for rendered sign clips.
+
+Each sign's inputs (its pose data or gesture script, the .blend file, the
+background image and the render settings) are hashed into one digest. A sign
+is skipped when its clip exists and the manifest records the same digest, so
+editing one handshape re-renders one clip instead of the whole alphabet.
+
+The manifest lives next to the clips as render_manifest.json:
+
+    {"a": {"hash": "...", "output": "/abs/a.mp4", "render_seconds": 12.3, "frames": 90,
+           "verification": {"ok": true, "problems": [], "codec": "h264", ...}}, ...}
+
+A clip whose verification failed is never fresh, so it is rendered again.
+"""
+import hashlib
+import json
+import os
+
+MANIFEST_NAME = "render_manifest.json"
+
+_file_digests = {}
+
+
+def file_digest(path):
+    """sha256 of a file's contents ("missing" when it does not exist)."""
+    path = os.path.abspath(path)
+    stat = os.stat(path) if os.path.exists(path) else None
+    if stat is None:
+        return "missing"
+    cache_key = (path, stat.st_mtime_ns, stat.st_size)
+    if cache_key not in _file_digests:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        _file_digests[cache_key] = h.hexdigest()
+    return _file_digests[cache_key]
+
+
+def settings_digest(settings):
+    """Digest of the shared inputs: a dict of file paths and plain settings.
+
+    Values that name an existing file are hashed by content; anything else is
+    hashed by its JSON form.
+    """
+    parts = {}
+    for key, value in sorted(settings.items()):
+        if isinstance(value, str) and os.path.isfile(value):
+            parts[key] = file_digest(value)
+        else:
+            parts[key] = value
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+
+def pose_digest(lib, name):
+    """Digest of one sign's rows in the pose library."""
+    s = lib.index[name]
+    h = hashlib.sha256()
+    keyed = lib.mask[s]
+    h.update("\n".join(b for b, k in zip(lib.bones, keyed) if k).encode())
+    h.update(lib.euler[s][keyed].tobytes())
+    h.update(lib.rest_euler[s][keyed].tobytes())
+    # Every hold key: a letter's hold-end key need not equal its pose
+    count = lib.hold_count[s]
+    h.update(lib.hold_phase[s, :count].tobytes())
+    h.update(lib.hold_euler[s, :count][:, keyed].tobytes())
+    return h.hexdigest()
+
+
+def sign_digest(sign_input, shared_digest):
+    return hashlib.sha256(f"{sign_input}:{shared_digest}".encode()).hexdigest()
+
+
+def manifest_path(output_dir):
+    return os.path.join(output_dir, MANIFEST_NAME)
+
+
+def load_manifest(output_dir):
+    path = manifest_path(output_dir)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_manifest(output_dir, manifest):
+    path = manifest_path(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def is_fresh(manifest, sign, digest):
+    entry = manifest.get(sign)
+    return (bool(entry) and entry["hash"] == digest and os.path.exists(entry["output"])
+            and entry.get("verification", {}).get("ok", True))
+
+
+def record(manifest, sign, digest, output, render_seconds=None, frames=None):
+    manifest[sign] = {
+        "hash": digest,
+        "output": os.path.abspath(output),
+        "render_seconds": render_seconds,
+        "frames": frames,
+    }
+
+
+def record_verification(manifest, sign, result):
+    if sign in manifest:
+        manifest[sign]["verification"] = result
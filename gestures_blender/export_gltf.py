@@ -0,0 +1,95 @@
+"""
+Batch glTF export of sign animations (run inside Blender).
+
+Keys every sign from pose_library.npz (the data the ALPHABATES scripts are
+built from) as its own action on the one SMPL-X armature, then writes all of
+them with a single glTF export: one .glb holding the skeleton and one
+animation clip per sign, named after the sign. The web avatar plays any sign
+client-side by name at its own resolution, with no video rendered or sent.
+
+Usage:
+    blender -b final_hello.blend -P export_gltf.py -- signs.glb              # every sign
+    blender -b final_hello.blend -P export_gltf.py -- signs.glb a b hello
+    blender -b final_hello.blend -P export_gltf.py -- signs.glb --with-mesh  # skinned avatar too
+
+Without --with-mesh the pack holds only the armature and its clips, so it
+stays small and the avatar mesh is loaded once from its own file.
+"""
+import argparse
+import os
+import sys
+
+import bpy
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from animator import restore_pose, setup_armature, snapshot_pose  # noqa: E402
+from keyframes import write_tracks  # noqa: E402
+from pose_compiler import SIGN_FRAMES, sequence_length, sequence_tracks  # noqa: E402
+from pose_library import LIBRARY_PATH, load_library  # noqa: E402
+
+
+def add_sign_actions(obj, lib, names):
+    """Key each sign as an action named after it; returns the actions."""
+    initial_pose = snapshot_pose(obj)
+    actions = []
+    for name in names:
+        restore_pose(obj, initial_pose)
+        write_tracks(obj, sequence_tracks(lib, [name]), action_name=name)
+        action = obj.animation_data.action
+        # Kept (and exported) even though no object uses it after the next sign
+        action.use_fake_user = True
+        action.frame_range = (SIGN_FRAMES[0], sequence_length(1))
+        actions.append(action)
+    restore_pose(obj, initial_pose)
+    return actions
+
+
+def select_for_export(obj, with_mesh=False):
+    bpy.ops.object.mode_set(mode='OBJECT')
+    bpy.ops.object.select_all(action='DESELECT')
+    obj.select_set(True)
+    if with_mesh:
+        for child in obj.children:
+            child.select_set(True)
+    bpy.context.view_layer.objects.active = obj
+
+
+def export_pack(output_path, names=None, lib=None, with_mesh=False):
+    """Write every sign in ``names`` (default: the whole library) to one .glb/.gltf."""
+    lib = lib or load_library(LIBRARY_PATH)
+    names = names or list(lib.names)
+    missing = [name for name in names if name not in lib]
+    if missing:
+        raise KeyError(f"Signs not in pose library: {', '.join(missing)}")
+
+    obj = setup_armature()
+    actions = add_sign_actions(obj, lib, names)
+    select_for_export(obj, with_mesh)
+    bpy.ops.export_scene.gltf(
+        filepath=os.path.abspath(output_path),
+        export_format='GLTF_SEPARATE' if output_path.endswith(".gltf") else 'GLB',
+        use_selection=True,
+        export_skins=with_mesh,
+        export_animations=True,
+        export_animation_mode='ACTIONS',
+        export_reset_pose_bones=True,
+        export_optimize_animation_size=True,
+        export_apply=False,
+    )
+    print(f"✅ Exported {len(actions)} sign animations to {output_path}")
+    return output_path
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="blender -b final_hello.blend -P export_gltf.py --")
+    parser.add_argument("output", help="output .glb (or .gltf)")
+    parser.add_argument("signs", nargs="*", help="sign names (default: every sign in the library)")
+    parser.add_argument("--with-mesh", action="store_true", help="include the skinned avatar mesh")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    argv = sys.argv
+    argv = argv[argv.index("--") + 1:] if "--" in argv else []  # get args after '--'
+    args = parse_args(argv)
+    export_pack(args.output, args.signs, with_mesh=args.with_mesh)
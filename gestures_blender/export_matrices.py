@@ -0,0 +1,86 @@
+"""
+Export evaluated per-frame bone matrices of every sign (run inside Blender).
+
+Each sign is keyed on the SMPL-X armature like animator.py does, then the
+armature is evaluated at every frame and the world-space matrix of every pose
+bone is read in one ``foreach_get`` per frame, straight into a float32 array
+on disk (see bone_matrices.py for the layout and the reader). Analytics,
+recognizer training and client-side skinning map that file instead of
+running Blender.
+
+Usage:
+    blender -b final_hello.blend -P export_matrices.py -- bone_matrices.npy            # every sign
+    blender -b final_hello.blend -P export_matrices.py -- bone_matrices.npy a b hello
+    blender -b final_hello.blend -P export_matrices.py -- bone_matrices.npy --timing fingerspell
+"""
+import argparse
+import os
+import sys
+import time
+
+import bpy
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from animator import animate, blend_fps, restore_pose, setup_armature, snapshot_pose  # noqa: E402
+from bone_matrices import DTYPE, create_matrices, write_index  # noqa: E402
+from pose_compiler import SIGN_FRAMES, TIMING_PROFILES, sequence_length, timing_profile  # noqa: E402
+from pose_library import LIBRARY_PATH, load_library  # noqa: E402
+
+
+def evaluate_frames(obj, frames, out):
+    """Fill ``out`` ``(frames, bones, 4, 4)`` with world matrices of ``obj``'s pose bones."""
+    scene = bpy.context.scene
+    world = np.array(obj.matrix_world, dtype=DTYPE)
+    bone_count = len(obj.pose.bones)
+    flat = np.empty(bone_count * 16, dtype=DTYPE)
+    for i, frame in enumerate(frames):
+        scene.frame_set(int(frame))
+        obj.pose.bones.foreach_get("matrix", flat)
+        # Blender hands matrices out column-major
+        out[i] = world @ flat.reshape(bone_count, 4, 4).transpose(0, 2, 1)
+
+
+def export_matrices(output_path, names=None, lib=None, timing=None):
+    """Write the bone matrices of ``names`` (default: the whole library) to ``output_path``."""
+    lib = lib or load_library(LIBRARY_PATH)
+    names = names or list(lib.names)
+    missing = [name for name in names if name not in lib]
+    if missing:
+        raise KeyError(f"Signs not in pose library: {', '.join(missing)}")
+
+    obj = setup_armature()
+    initial_pose = snapshot_pose(obj)
+    bones = [bone.name for bone in obj.pose.bones]
+    frames = np.arange(SIGN_FRAMES[0], sequence_length(1, timing) + 1)
+    matrices = create_matrices(output_path, names, bones, frames)
+
+    started = time.perf_counter()
+    for s, name in enumerate(names):
+        restore_pose(obj, initial_pose)
+        animate(obj, lib, [name], timing=timing)
+        evaluate_frames(obj, frames, matrices[s])
+    restore_pose(obj, initial_pose)
+    matrices.flush()
+    del matrices
+
+    fps = timing_profile(timing)["fps"] or blend_fps()
+    write_index(output_path, names, bones, frames, fps, timing)
+    elapsed = time.perf_counter() - started
+    print(f"✅ {len(names)} signs x {len(frames)} frames x {len(bones)} bones in {elapsed:.1f}s -> {output_path}")
+    return output_path
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="blender -b final_hello.blend -P export_matrices.py --")
+    parser.add_argument("output", help="output .npy (the index goes next to it as .json)")
+    parser.add_argument("signs", nargs="*", help="sign names (default: every sign in the library)")
+    parser.add_argument("--timing", choices=sorted(TIMING_PROFILES), help="sign timing profile")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    argv = sys.argv
+    argv = argv[argv.index("--") + 1:] if "--" in argv else []  # get args after '--'
+    args = parse_args(argv)
+    export_matrices(os.path.abspath(args.output), args.signs, timing=args.timing)
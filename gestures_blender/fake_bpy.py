@@ -0,0 +1,302 @@
+"""
+Lightweight stand-in for Blender's ``bpy`` that records what a script does.
+
+Enough of the API used by the gesture scripts, animator.py and keyframes.py
+is modelled to run them on any Python with NumPy: pose bones, keyframe_insert,
+actions/fcurves with foreach_set, scene.frame_set (which applies the
+armatures' fcurves), and the scene/world/ops calls, which are accepted and
+logged. Nothing is rendered. Pose bone matrices are each bone's own rotation
+only: there is no rest pose or parent chain.
+
+    with fake_bpy.installed() as bpy:
+        runpy.run_path("ALPHABATES/a.py")
+    keys = fake_bpy.recorded_keys(bpy)     # [(bone, data_path, channel, frame, value), ...]
+"""
+import contextlib
+import re
+import sys
+import types
+
+import numpy as np
+
+_BONE_PATH = re.compile(r'pose\.bones\["([^"]+)"\]\.(\w+)')
+
+
+class _Sink:
+    """Accepts any attribute, item or call. Calls are logged; children persist."""
+
+    def __init__(self, path, calls):
+        object.__setattr__(self, "_path", path)
+        object.__setattr__(self, "_calls", calls)
+        object.__setattr__(self, "_children", {})
+
+    def _child(self, key, path):
+        children = object.__getattribute__(self, "_children")
+        if key not in children:
+            children[key] = _Sink(path, self._calls)
+        return children[key]
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        if name == "animation_data":
+            # Nothing but the armatures is animated
+            return None
+        return self._child(name, f"{self._path}.{name}")
+
+    def __getitem__(self, key):
+        return self._child(("item", key), f"{self._path}[{key!r}]")
+
+    def __call__(self, *args, **kwargs):
+        self._calls.append((self._path, args, kwargs))
+        return _Sink(f"{self._path}()", self._calls)
+
+    def __setitem__(self, key, value):
+        self._calls.append((f"{self._path}[{key!r}]", (value,), {}))
+
+    def get(self, key, default=None):
+        return default
+
+    def __iter__(self):
+        return iter(())
+
+    def __len__(self):
+        return 0
+
+
+class _PoseBone:
+    def __init__(self, name, armature):
+        self.name = name
+        self.rotation_mode = 'QUATERNION'
+        self.rotation_euler = (0.0, 0.0, 0.0)
+        self.rotation_quaternion = (1.0, 0.0, 0.0, 0.0)
+        self.location = (0.0, 0.0, 0.0)
+        self.scale = (1.0, 1.0, 1.0)
+        self._armature = armature
+
+    @property
+    def matrix(self):
+        if self.rotation_mode == 'QUATERNION':
+            w, x, y, z = self.rotation_quaternion
+            rotation = [
+                [1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y)],
+                [2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x)],
+                [2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y)],
+            ]
+        else:
+            cx, cy, cz = np.cos(self.rotation_euler)
+            sx, sy, sz = np.sin(self.rotation_euler)
+            # XYZ euler: Rz @ Ry @ Rx
+            rotation = [
+                [cy * cz, sx * sy * cz - cx * sz, cx * sy * cz + sx * sz],
+                [cy * sz, sx * sy * sz + cx * cz, cx * sy * sz - sx * cz],
+                [-sy, sx * cy, cx * cy],
+            ]
+        matrix = np.eye(4)
+        matrix[:3, :3] = rotation
+        matrix[:3, 3] = self.location
+        return matrix
+
+    def keyframe_insert(self, data_path, frame=None, index=-1):
+        values = getattr(self, data_path)
+        channels = range(len(values)) if index < 0 else [index]
+        for channel in channels:
+            self._armature.inserted.append((self.name, data_path, channel, int(frame), float(values[channel])))
+        return True
+
+
+class _PoseBones(dict):
+    """Bones are created on first use; every name counts as present, like SMPL-X's full rig."""
+
+    def __init__(self, armature):
+        super().__init__()
+        self._armature = armature
+
+    def __missing__(self, name):
+        bone = self[name] = _PoseBone(name, self._armature)
+        return bone
+
+    def __contains__(self, name):
+        return True
+
+    def __iter__(self):
+        return iter(list(self.values()))
+
+    def foreach_get(self, attr, seq):
+        # Matrices come out column-major, as Blender stores them
+        values = [np.asarray(getattr(bone, attr), dtype=np.float64).T.ravel() for bone in self.values()]
+        seq[:] = np.concatenate(values) if values else []
+
+
+class _KeyframePoints:
+    def __init__(self):
+        self.co = np.zeros((0, 2), dtype=np.float32)
+
+    def add(self, count):
+        self.co = np.concatenate([self.co, np.zeros((count, 2), dtype=np.float32)])
+
+    def foreach_set(self, attr, seq):
+        if attr == "co":
+            self.co = np.asarray(seq, dtype=np.float32).reshape(-1, 2).copy()
+
+    def __len__(self):
+        return len(self.co)
+
+
+class _FCurve:
+    def __init__(self, data_path, index, group):
+        self.data_path = data_path
+        self.array_index = index
+        self.group = group
+        self.keyframe_points = _KeyframePoints()
+
+    def update(self):
+        pass
+
+    def evaluate(self, frame):
+        # Linear between keys, constant outside; exact at the keyed frames
+        co = self.keyframe_points.co
+        return float(np.interp(frame, co[:, 0], co[:, 1])) if len(co) else 0.0
+
+
+class _FCurves(list):
+    def new(self, data_path, index=0, action_group=""):
+        fcurve = _FCurve(data_path, index, action_group)
+        self.append(fcurve)
+        return fcurve
+
+
+class _Action:
+    def __init__(self, name):
+        self.name = name
+        self.fcurves = _FCurves()
+
+
+class _Actions(dict):
+    def new(self, name):
+        action = self[name] = _Action(name)
+        return action
+
+    def remove(self, action):
+        self.pop(action.name, None)
+
+
+class _Armature:
+    def __init__(self, name):
+        self.name = name
+        self.pose = types.SimpleNamespace(bones=_PoseBones(self))
+        self.animation_data = None
+        self.inserted = []
+        self.type = 'ARMATURE'
+        self.data = None
+        self.material_slots = []
+        self.children = []
+        self.selected = False
+        self.matrix_world = np.eye(4)
+
+    def select_set(self, state):
+        self.selected = state
+
+    def animation_data_create(self):
+        if self.animation_data is None:
+            self.animation_data = types.SimpleNamespace(action=None)
+        return self.animation_data
+
+    def animation_data_clear(self):
+        self.animation_data = None
+        self.inserted.clear()
+
+
+class _Objects(dict):
+    def __missing__(self, name):
+        obj = self[name] = _Armature(name)
+        return obj
+
+
+def _frame_set(bpy, frame):
+    """Go to ``frame``: every armature's action is evaluated onto its pose bones."""
+    bpy.context.scene.frame_current = frame
+    for obj in bpy.data.objects.values():
+        action = obj.animation_data and obj.animation_data.action
+        if action is None:
+            continue
+        for fcurve in action.fcurves:
+            match = _BONE_PATH.match(fcurve.data_path)
+            if not match:
+                continue
+            bone = obj.pose.bones[match.group(1)]
+            values = list(getattr(bone, match.group(2)))
+            values[fcurve.array_index] = fcurve.evaluate(frame)
+            setattr(bone, match.group(2), tuple(values))
+
+
+def new_bpy():
+    """A fresh recording ``bpy`` module. ``bpy.calls`` logs every ops/scene call."""
+    bpy = types.ModuleType("bpy")
+    bpy.calls = []
+    bpy.data = types.SimpleNamespace(
+        objects=_Objects(),
+        actions=_Actions(),
+        images=_Sink("bpy.data.images", bpy.calls),
+        worlds=_Sink("bpy.data.worlds", bpy.calls),
+        filepath="",
+    )
+    scene = _Sink("bpy.context.scene", bpy.calls)
+    scene.frame_start, scene.frame_end = 1, 250
+    scene.render.fps, scene.render.fps_base = 24, 1.0
+    scene.render.threads = 4
+    scene.render.resolution_x, scene.render.resolution_y = 1920, 1080
+    scene.render.resolution_percentage = 100
+    scene.render.use_motion_blur = False
+    scene.render.film_transparent = False
+    scene.objects = bpy.data.objects.values()
+    scene.world = _Sink("bpy.context.scene.world", bpy.calls)
+    scene.frame_set = lambda frame, subframe=0.0: _frame_set(bpy, frame)
+    bpy.context = _Sink("bpy.context", bpy.calls)
+    bpy.context.scene = scene
+    bpy.ops = _Sink("bpy.ops", bpy.calls)
+    return bpy
+
+
+@contextlib.contextmanager
+def installed(argv=None):
+    """Make ``import bpy`` return a fresh recording module inside the block.
+
+    ``argv`` replaces ``sys.argv`` (gesture scripts read it after ``--``).
+    """
+    bpy = new_bpy()
+    saved_bpy = sys.modules.get("bpy")
+    saved_argv = sys.argv
+    sys.modules["bpy"] = bpy
+    if argv is not None:
+        sys.argv = argv
+    try:
+        yield bpy
+    finally:
+        sys.argv = saved_argv
+        if saved_bpy is None:
+            del sys.modules["bpy"]
+        else:
+            sys.modules["bpy"] = saved_bpy
+
+
+def recorded_keys(bpy):
+    """Every key written on every object: ``(bone, data_path, channel, frame, value)``.
+
+    Covers both ``keyframe_insert`` calls and fcurves filled through
+    ``keyframe_points.foreach_set``.
+    """
+    keys = []
+    for obj in bpy.data.objects.values():
+        keys.extend(obj.inserted)
+        action = obj.animation_data and obj.animation_data.action
+        if action is None:
+            continue
+        for fcurve in action.fcurves:
+            match = _BONE_PATH.match(fcurve.data_path)
+            if not match:
+                continue
+            bone, data_path = match.groups()
+            for frame, value in fcurve.keyframe_points.co:
+                keys.append((bone, data_path, fcurve.array_index, int(round(frame)), float(value)))
+    return keys
@@ -0,0 +1,123 @@
+"""
+Nearest-handshape index over the pose library (no bpy needed).
+
+"Which letter is closest to this hand pose?" for recognition and quality
+control. Every alphabet sign's held pose is reduced to the quaternions of the
+right hand's bones (wrist and the 15 finger joints); a query pose is compared
+with all of them at once. The distance is the mean geodesic angle per bone,
+``2 * arccos(|q1 . q2|)``, so q and -q count as the same rotation and euler
+wrap-around (b and c's thumb) does not matter.
+
+The library has a few dozen handshapes, so a brute-force distance matrix is
+exact and faster than any tree: a batch of poses is one einsum, one arccos and
+one sort, chunked to bound memory.
+
+    index = HandshapeIndex(load_library())
+    labels, angles = index.query(quat)              # quat (poses, bones, 4), bones = index.bones
+    labels = index.classify_euler(euler)            # (poses, bones, 3) XYZ radians
+
+Usage:
+    python handshape_index.py                       # self-check and timing on noisy library poses
+    python handshape_index.py --poses 100000 --noise 0.1
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from interpolation import quat_multiply
+from pose_compiler import HAND_BONES
+from pose_library import LIBRARY_PATH, ensure_library, euler_to_quat, load_library
+
+# Distance matrix entries per chunk (poses x handshapes x bones), about 64 MB of float64
+CHUNK_ENTRIES = 8_000_000
+
+
+def alphabet(lib):
+    """The fingerspelling signs of ``lib`` (single letters; words are not handshapes)."""
+    return [name for name in lib.names if len(name) == 1]
+
+
+def pose_distances(quat, handshapes):
+    """Mean geodesic angle (radians) from each pose ``(poses, bones, 4)`` to each handshape ``(shapes, bones, 4)``."""
+    dots = np.abs(np.einsum("pbk,sbk->psb", quat, handshapes))
+    return 2 * np.arccos(np.clip(dots, 0.0, 1.0)).mean(axis=-1)
+
+
+class HandshapeIndex:
+    """Held handshapes of ``names`` (default: the alphabet) as one ``(shapes, bones, 4)`` array."""
+
+    def __init__(self, lib, names=None, bones=HAND_BONES):
+        self.names = list(names or alphabet(lib))
+        self.bones = [bone for bone in bones if bone in lib.bone_index]
+        rows = [lib.index[name] for name in self.names]
+        columns = [lib.bone_index[bone] for bone in self.bones]
+        self.handshapes = np.asarray(lib.quat, dtype=np.float64)[np.ix_(rows, columns)]
+        self.labels = np.array(self.names)
+
+    def distances(self, quat):
+        """``(poses, shapes)`` distance matrix for ``quat`` ``(poses, bones, 4)`` in ``self.bones`` order."""
+        quat = np.asarray(quat, dtype=np.float64)
+        if quat.ndim == 2:
+            quat = quat[None]
+        if quat.shape[1:] != self.handshapes.shape[1:]:
+            raise ValueError(f"expected poses of shape (n, {len(self.bones)}, 4), got {quat.shape}")
+        quat = quat / np.linalg.norm(quat, axis=-1, keepdims=True)
+        chunk = max(1, CHUNK_ENTRIES // self.handshapes[..., 0].size)
+        return np.concatenate([pose_distances(quat[i:i + chunk], self.handshapes)
+                               for i in range(0, len(quat), chunk)] or [np.empty((0, len(self.names)))])
+
+    def query(self, quat, k=1):
+        """The ``k`` closest handshapes per pose: ``(labels, angles)``, both ``(poses, k)``, nearest first."""
+        dist = self.distances(quat)
+        nearest = np.argsort(dist, axis=1)[:, :k]
+        return self.labels[nearest], np.take_along_axis(dist, nearest, axis=1)
+
+    def classify(self, quat):
+        """Closest handshape name per pose, ``(poses,)``."""
+        return self.labels[self.distances(quat).argmin(axis=1)]
+
+    def classify_euler(self, euler):
+        """classify() for XYZ euler poses ``(poses, bones, 3)`` in radians."""
+        return self.classify(euler_to_quat(euler))
+
+    def confusable(self, threshold):
+        """Handshape pairs closer than ``threshold`` radians: ``[(a, b, angle), ...]``."""
+        dist = pose_distances(self.handshapes, self.handshapes)
+        return [(self.names[i], self.names[j], float(dist[i, j]))
+                for i, j in zip(*np.nonzero(np.triu(dist < threshold, k=1)))]
+
+
+def noisy_poses(index, count, noise, seed=0):
+    """``count`` library handshapes with every bone turned by up to about ``noise`` radians."""
+    rng = np.random.default_rng(seed)
+    truth = rng.integers(len(index.names), size=count)
+    euler_noise = rng.normal(scale=noise / np.sqrt(3), size=(count, len(index.bones), 3))
+    return quat_multiply(index.handshapes[truth], euler_to_quat(euler_noise)), index.labels[truth]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Classify hand poses against the alphabet handshapes")
+    parser.add_argument("--poses", type=int, default=10000, help="noisy poses to classify")
+    parser.add_argument("--noise", type=float, default=0.1, help="per-bone rotation noise, radians")
+    parser.add_argument("--confusable", type=float, default=0.1,
+                        help="report handshape pairs closer than this many radians")
+    args = parser.parse_args()
+
+    lib = load_library(ensure_library(LIBRARY_PATH))
+    index = HandshapeIndex(lib)
+    exact = index.classify(index.handshapes)
+    wrong = [f"{name}->{got}" for name, got in zip(index.names, exact) if name != got]
+    for a, b, angle in index.confusable(args.confusable):
+        print(f"⚠️ {a} and {b} are {np.degrees(angle):.1f}° apart")
+
+    poses, truth = noisy_poses(index, args.poses, args.noise)
+    started = time.perf_counter()
+    labels = index.classify(poses)
+    elapsed = (time.perf_counter() - started) * 1000
+    accuracy = float(np.mean(labels == truth))
+    print(f"{'❌' if wrong else '✅'} {len(index.names)} handshapes x {len(index.bones)} bones"
+          f"{', misclassified: ' + ' '.join(wrong) if wrong else ''}")
+    print(f"✅ {args.poses} poses classified in {elapsed:.1f} ms, {accuracy:.1%} correct at {args.noise} rad noise")
+    sys.exit(1 if wrong else 0)
@@ -0,0 +1,182 @@
+"""
+Image-sequence helpers for the sign render pipeline (no bpy needed).
+
+Frames are rendered to numbered PNGs and encoded to MP4 with ffmpeg in a
+separate step. Frames inside a static span (no animated channel changes value)
+are rendered once and hard-linked for the rest of the span, so the held pose
+of a sign costs one render instead of ~40. Shards of one frame range can be
+rendered by several Blender processes into the same directory and encoded
+together, since every frame is its own file.
+
+Lower frame rates that divide a rendered one are made by linking every n-th
+frame into a new sequence (select_frames) instead of rendering again.
+
+Frame directories are deterministic (<output>.frames) and tagged with a
+fingerprint of the animation, so a render that dies part way resumes from the
+frames already on disk instead of starting over.
+"""
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+
+import numpy as np
+
+FFMPEG_PATH = os.environ.get("FFMPEG_PATH", "ffmpeg")
+FRAME_DIGITS = 6
+SEQUENCE_INFO = "sequence.json"
+
+# Channel values closer than this (radians / blender units) count as unchanged
+STATIC_TOLERANCE = 1e-6
+
+
+def frame_path(frames_dir, frame):
+    return os.path.join(frames_dir, f"{frame:0{FRAME_DIGITS}d}.png")
+
+
+def frames_dir_for(output_path):
+    return os.path.splitext(os.path.abspath(output_path))[0] + ".frames"
+
+
+def is_complete_frame(path):
+    """True for a PNG that was fully written (ends with its IEND chunk)."""
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() < 20:
+                return False
+            f.seek(-8, os.SEEK_END)
+            return f.read(4) == b"IEND"
+    except OSError:
+        return False
+
+
+def fingerprint(values, settings):
+    """Digest of an animation's per-frame channel values plus its render settings."""
+    h = hashlib.sha256(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+    h.update(json.dumps(settings, sort_keys=True).encode())
+    return h.hexdigest()
+
+
+def shard_range(frame_start, frame_end, shard, shard_count):
+    """Inclusive frames of shard ``shard`` (1-based) when splitting the range ``shard_count`` ways."""
+    total = frame_end - frame_start + 1
+    first = frame_start + total * (shard - 1) // shard_count
+    last = frame_start + total * shard // shard_count - 1
+    return first, last
+
+
+def write_sequence_info(frames_dir, fps, frame_start, frame_end, animation=None):
+    """Record what the full sequence looks like so it can be encoded without Blender."""
+    info = {"fps": fps, "frame_start": frame_start, "frame_end": frame_end, "animation": animation}
+    tmp_path = os.path.join(frames_dir, f".{SEQUENCE_INFO}.{os.getpid()}")
+    with open(tmp_path, "w") as f:
+        json.dump(info, f)
+    os.replace(tmp_path, os.path.join(frames_dir, SEQUENCE_INFO))
+
+
+def read_sequence_info(frames_dir):
+    path = os.path.join(frames_dir, SEQUENCE_INFO)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def prepare_frames_dir(frames_dir, fps, frame_start, frame_end, animation):
+    """Create ``frames_dir`` for resuming; drop frames left by a different animation."""
+    os.makedirs(frames_dir, exist_ok=True)
+    info = read_sequence_info(frames_dir)
+    if info is None or info.get("animation") != animation:
+        for filename in os.listdir(frames_dir):
+            if filename.endswith(".png"):
+                os.remove(os.path.join(frames_dir, filename))
+    write_sequence_info(frames_dir, fps, frame_start, frame_end, animation)
+
+
+def missing_frames(frames_dir, frame_start, frame_end):
+    return [f for f in range(frame_start, frame_end + 1)
+            if not is_complete_frame(frame_path(frames_dir, f))]
+
+
+def static_spans(values, first_frame=1, atol=STATIC_TOLERANCE):
+    """Split frames into runs that render identically.
+
+    ``values`` is ``(frames, channels)``: every animated channel evaluated at
+    consecutive frames starting at ``first_frame``. Returns inclusive
+    ``(start, end)`` frame pairs; a frame joins the current span while no
+    channel differs from the span's first frame by more than ``atol``.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+    spans = []
+    start = 0
+    for i in range(1, len(values)):
+        if np.any(np.abs(values[i] - values[start]) > atol):
+            spans.append((first_frame + start, first_frame + i - 1))
+            start = i
+    if len(values):
+        spans.append((first_frame + start, first_frame + len(values) - 1))
+    return spans
+
+
+def link_duplicates(frames_dir, first, last):
+    """Fill frames ``first+1..last`` with the already rendered ``first`` frame."""
+    source = frame_path(frames_dir, first)
+    for frame in range(first + 1, last + 1):
+        target = frame_path(frames_dir, frame)
+        if os.path.exists(target):
+            os.remove(target)
+        try:
+            os.link(source, target)
+        except OSError:
+            shutil.copyfile(source, target)
+
+
+def select_frames(frames_dir, target_dir, frame_start, frame_end, every):
+    """Link every ``every``-th frame of a sequence into ``target_dir``, renumbered from ``frame_start``.
+
+    Frame ``frame_start + k * every`` becomes ``frame_start + k``: the same
+    instants at 1/every of the frame rate, without rendering anything.
+    Returns the number of frames selected.
+    """
+    os.makedirs(target_dir, exist_ok=True)
+    sources = range(frame_start, frame_end + 1, every)
+    for k, frame in enumerate(sources):
+        source, target = frame_path(frames_dir, frame), frame_path(target_dir, frame_start + k)
+        if os.path.exists(target):
+            os.remove(target)
+        try:
+            os.link(source, target)
+        except OSError:
+            shutil.copyfile(source, target)
+    return len(sources)
+
+
+def encode_sequence(frames_dir, output_path, fps, start_frame=1, ffmpeg=FFMPEG_PATH, wait=True,
+                    threads=None, frame_count=None, start_new_session=False):
+    """Encode ``frames_dir``'s numbered PNGs into an H.264 MP4.
+
+    With ``wait=False`` the ffmpeg process is returned still running, so the
+    caller can render the next clip while this one encodes. ``threads`` caps
+    the encoder's threads (by default x264 takes every core, fighting the
+    renders running next to it). ``frame_count`` stops after that many
+    frames instead of at the end of the sequence. ``start_new_session``
+    keeps ffmpeg out of the caller's Ctrl-C.
+    """
+    cmd = [
+        ffmpeg, "-y", "-loglevel", "error",
+        "-framerate", f"{fps:g}",
+        "-start_number", str(start_frame),
+        "-i", os.path.join(frames_dir, f"%0{FRAME_DIGITS}d.png"),
+        "-c:v", "libx264", "-pix_fmt", "yuv420p",
+        *(["-threads", str(threads)] if threads else []),
+        *(["-frames:v", str(frame_count)] if frame_count else []),
+        output_path,
+    ]
+    if not wait:
+        return subprocess.Popen(cmd, start_new_session=start_new_session)
+    subprocess.run(cmd, check=True, start_new_session=start_new_session)
+    return output_path
@@ -0,0 +1,215 @@
+"""
+Vectorized quaternion interpolation of sign sequences (no bpy needed).
+
+Blender interpolates the euler keys of animator.py at render time, one
+channel at a time. This module does the same job for everything that is not
+Blender: the pose library is converted to quaternions and every frame of a
+whole sign sequence is produced with NumPy in one slerp (or squad) pass per
+bone, with a configurable easing inside each key segment.
+
+The result is dense per-frame rotations:
+
+    frames  (frames,)                   timeline frame numbers
+    bones   (bones,)                    SMPL-X pose bone names
+    quat    (frames, bones, 4)          (w, x, y, z), sign-continuous over time
+
+which can be keyed into Blender in bulk (``rotation_tracks`` +
+keyframes.write_tracks), saved for the web avatar (``.json``) or fed to the
+recognizer as arrays (``.npz``). Interpolation takes the shortest arc, so a
+key that spins a bone past a full turn (b and c's thumb) is not reproduced.
+
+Usage:
+    python interpolation.py hello.npz h e l l o --sentence
+    python interpolation.py hello.json h e l l o --easing linear --method squad
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from pose_compiler import TIMING_PROFILES, sentence_tracks, sequence_tracks
+from pose_library import LIBRARY_PATH, ensure_library, euler_to_quat, load_library
+
+DEFAULT_FPS = 24
+
+
+def _smoothstep(t):
+    return t * t * (3 - 2 * t)
+
+
+# Remap of the 0..1 position inside a key segment; smoothstep is close to
+# Blender's default auto-clamped Bezier between two held poses
+EASINGS = {
+    "linear": lambda t: t,
+    "smoothstep": _smoothstep,
+    "ease_in": lambda t: t * t,
+    "ease_out": lambda t: t * (2 - t),
+    "smootherstep": lambda t: t * t * t * (t * (6 * t - 15) + 10),
+}
+DEFAULT_EASING = "smoothstep"
+METHODS = ("slerp", "squad")
+
+
+def quat_multiply(a, b):
+    aw, ax, ay, az = np.moveaxis(a, -1, 0)
+    bw, bx, by, bz = np.moveaxis(b, -1, 0)
+    return np.stack([
+        aw * bw - ax * bx - ay * by - az * bz,
+        aw * bx + ax * bw + ay * bz - az * by,
+        aw * by - ax * bz + ay * bw + az * bx,
+        aw * bz + ax * by - ay * bx + az * bw,
+    ], axis=-1)
+
+
+def quat_conjugate(q):
+    return q * np.array([1.0, -1.0, -1.0, -1.0])
+
+
+def quat_log(q):
+    """Log of unit quaternions as pure quaternions ``(0, axis * angle / 2)``."""
+    w = np.clip(q[..., :1], -1.0, 1.0)
+    v = q[..., 1:]
+    norm = np.linalg.norm(v, axis=-1, keepdims=True)
+    half = np.arctan2(norm, w)
+    scale = np.where(norm > 1e-12, half / np.maximum(norm, 1e-12), 1.0)
+    return np.concatenate([np.zeros_like(w), v * scale], axis=-1)
+
+
+def quat_exp(q):
+    v = q[..., 1:]
+    half = np.linalg.norm(v, axis=-1, keepdims=True)
+    scale = np.where(half > 1e-12, np.sin(half) / np.maximum(half, 1e-12), 1.0)
+    return np.concatenate([np.cos(half), v * scale], axis=-1)
+
+
+def make_continuous(quats, axis=0):
+    """Flip signs along ``axis`` so neighbours sit in the same hemisphere (q and -q are one rotation)."""
+    quats = np.moveaxis(np.array(quats, dtype=np.float64), axis, 0)
+    dots = np.einsum("i...k,i...k->i...", quats[1:], quats[:-1])
+    flips = np.cumprod(np.where(dots < 0, -1.0, 1.0), axis=0)
+    quats[1:] *= flips[..., None]
+    return np.moveaxis(quats, 0, axis)
+
+
+def slerp(q0, q1, t):
+    """Spherical interpolation between unit quaternions, broadcasting over everything."""
+    t = np.asarray(t, dtype=np.float64)[..., None]
+    dot = np.sum(q0 * q1, axis=-1, keepdims=True)
+    q1 = np.where(dot < 0, -q1, q1)
+    dot = np.abs(dot)
+    angle = np.arccos(np.clip(dot, -1.0, 1.0))
+    sin = np.sin(angle)
+    # Nearly equal rotations: lerp is exact enough and avoids dividing by ~0
+    near = sin < 1e-6
+    safe = np.where(near, 1.0, sin)
+    w0 = np.where(near, 1 - t, np.sin((1 - t) * angle) / safe)
+    w1 = np.where(near, t, np.sin(t * angle) / safe)
+    out = w0 * q0 + w1 * q1
+    return out / np.linalg.norm(out, axis=-1, keepdims=True)
+
+
+def squad_controls(keys):
+    """Inner control quaternions of squad for ``keys`` ``(k, ..., 4)`` (ends are their own control)."""
+    keys = make_continuous(keys)
+    prev = np.concatenate([keys[:1], keys[:-1]])
+    nxt = np.concatenate([keys[1:], keys[-1:]])
+    inv = quat_conjugate(keys)
+    tangent = -0.25 * (quat_log(quat_multiply(inv, nxt)) + quat_log(quat_multiply(inv, prev)))
+    return quat_multiply(keys, quat_exp(tangent))
+
+
+def interpolate(key_frames, keys, frames, easing=DEFAULT_EASING, method="slerp"):
+    """Rotations at ``frames`` from ``keys`` ``(k, ..., 4)`` keyed at sorted ``key_frames``.
+
+    Held constant before the first and after the last key, like Blender's
+    fcurves. ``easing`` names an entry of EASINGS (or is a callable) applied
+    to each segment's 0..1 position; ``method`` is "slerp" or "squad" (smooth
+    through the keys instead of only continuous).
+    """
+    ease = EASINGS[easing] if isinstance(easing, str) else easing
+    key_frames = np.asarray(key_frames, dtype=np.float64)
+    keys = make_continuous(keys)
+    frames = np.asarray(frames, dtype=np.float64)
+    if len(key_frames) == 1:
+        return np.broadcast_to(keys[0], (len(frames),) + keys.shape[1:]).copy()
+
+    segment = np.clip(np.searchsorted(key_frames, frames, side="right") - 1, 0, len(key_frames) - 2)
+    f0, f1 = key_frames[segment], key_frames[segment + 1]
+    t = np.clip((frames - f0) / np.maximum(f1 - f0, 1e-12), 0.0, 1.0)
+    t = ease(t).reshape((-1,) + (1,) * (keys.ndim - 2))
+    q0, q1 = keys[segment], keys[segment + 1]
+    if method == "slerp":
+        return slerp(q0, q1, t)
+    if method == "squad":
+        controls = squad_controls(keys)
+        return slerp(slerp(q0, q1, t), slerp(controls[segment], controls[segment + 1], t), 2 * t * (1 - t))
+    raise ValueError(f"unknown interpolation method {method!r}, expected one of {METHODS}")
+
+
+def dense_rotations(lib, names, sentence=False, easing=DEFAULT_EASING, method="slerp", frames=None,
+                    timing=None):
+    """Per-frame quaternions of ``names`` animated like animator.py would key them.
+
+    Returns ``(frames, bones, quat)`` with ``quat`` of shape ``(frames, bones, 4)``;
+    ``frames`` defaults to every frame from the first to the last key.
+    """
+    tracks = (sentence_tracks if sentence else sequence_tracks)(lib, names, timing)
+    bones = list(tracks)
+    if frames is None:
+        first = min(int(f[0]) for f, _ in tracks.values())
+        last = max(int(f[-1]) for f, _ in tracks.values())
+        frames = np.arange(first, last + 1)
+    frames = np.asarray(frames)
+    quat = np.empty((len(frames), len(bones), 4))
+    for b, bone in enumerate(bones):
+        key_frames, eulers = tracks[bone]
+        quat[:, b] = interpolate(key_frames, euler_to_quat(eulers), frames, easing, method)
+    return frames, bones, make_continuous(quat)
+
+
+def rotation_tracks(frames, bones, quat):
+    """Dense rotations as ``{bone: (frames, quats)}`` for keyframes.write_tracks."""
+    return {bone: (frames, quat[:, b]) for b, bone in enumerate(bones)}
+
+
+def save_rotations(path, frames, bones, quat, fps=DEFAULT_FPS):
+    """Write dense rotations as ``.npz`` (arrays) or ``.json`` (for the web avatar)."""
+    if path.endswith(".json"):
+        with open(path, "w") as f:
+            json.dump({
+                "fps": fps,
+                "quaternion_order": "wxyz",
+                "frames": np.asarray(frames).tolist(),
+                "bones": list(bones),
+                "quat": np.round(quat, 6).tolist(),
+            }, f)
+    else:
+        np.savez(path, frames=np.asarray(frames), bones=np.array(bones),
+                 quat=np.asarray(quat, dtype=np.float32), fps=fps)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dense quaternion rotations for a sign sequence")
+    parser.add_argument("output", help="output .npz or .json")
+    parser.add_argument("signs", nargs="+", help="sign names from the pose library")
+    parser.add_argument("--sentence", action="store_true", help="co-articulated, as animator.py --sentence")
+    parser.add_argument("--easing", choices=sorted(EASINGS), default=DEFAULT_EASING)
+    parser.add_argument("--method", choices=METHODS, default="slerp")
+    parser.add_argument("--timing", choices=sorted(TIMING_PROFILES), help="sign timing profile")
+    parser.add_argument("--fps", type=float, default=DEFAULT_FPS, help="frame rate stored with the output")
+    args = parser.parse_args()
+
+    lib = load_library(ensure_library(LIBRARY_PATH))
+    missing = [name for name in args.signs if name not in lib]
+    if missing:
+        sys.exit(f"❌ Signs not in pose library: {' '.join(missing)}")
+
+    started = time.perf_counter()
+    frames, bones, quat = dense_rotations(lib, args.signs, args.sentence, args.easing, args.method,
+                                          timing=args.timing)
+    elapsed = (time.perf_counter() - started) * 1000
+    save_rotations(args.output, frames, bones, quat, args.fps)
+    print(f"✅ {len(frames)} frames x {len(bones)} bones in {elapsed:.1f} ms -> {args.output}")
@@ -0,0 +1,235 @@
+"""
+Persistent render job table for main.py --schedule (no bpy needed).
+
+One SQLite file holds every job of a (possibly thousand-sign) rebuild, so a
+run that is stopped, drained or killed picks up where it left off:
+
+    jobs     one row per frame range of a sign ("render") or per clip to
+             encode once all of its ranges are done ("encode");
+             state is pending -> running -> done | failed
+    workers  heartbeat of every worker thread that ever claimed a job
+    settings the drain flag
+
+A worker claims a pending job under a lease and keeps extending it with
+heartbeats; a job whose lease runs out (its scheduler died) goes back to
+pending for anyone to take. A worker with nothing pending steals the back
+half of the running render with the most frames left: the victim's range is
+cut short (animator.py asks for its end after every span, see progress())
+and the thief renders the rest into the same frame directory. The last
+render range of a sign to finish queues its encode job.
+
+Every call is one short transaction, so several worker threads and several
+main.py processes can share one table.
+"""
+import os
+import socket
+import sqlite3
+import time
+from contextlib import contextmanager
+
+LEASE_SECONDS = 60               # a running job with no heartbeat for this long is requeued
+HEARTBEAT_INTERVAL = 10          # seconds between lease renewals
+MIN_STEAL_FRAMES = 8             # never split off fewer frames than this
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    sign TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    output TEXT NOT NULL,
+    frame_start INTEGER,
+    frame_end INTEGER,
+    progress INTEGER,
+    state TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_until REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    seconds REAL,
+    updated REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, id);
+CREATE INDEX IF NOT EXISTS jobs_sign ON jobs (sign);
+CREATE TABLE IF NOT EXISTS workers (name TEXT PRIMARY KEY, heartbeat REAL, job INTEGER);
+CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+class JobTable:
+    """One connection to the job table; use one per thread."""
+
+    def __init__(self, path, retries=2):
+        self.path = path
+        self.retries = retries
+        self.db = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    @contextmanager
+    def transaction(self):
+        # IMMEDIATE takes the write lock up front, so two claimers never pick the same row
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.db
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        self.db.execute("COMMIT")
+
+    def add_sign(self, sign, digest, output, frame_start, frame_end):
+        """Queue ``sign`` as one render job; keep its unfinished jobs when they are for the same digest.
+
+        Failed jobs of the same digest get a fresh set of retries.
+        """
+        with self.transaction() as db:
+            rows = db.execute("SELECT digest, kind, state FROM jobs WHERE sign = ?", (sign,)).fetchall()
+            encoded = any(r["kind"] == "encode" and r["state"] == "done" for r in rows)
+            if rows and all(r["digest"] == digest for r in rows) and not encoded:
+                db.execute("UPDATE jobs SET state = 'pending', attempts = 0, error = NULL "
+                           "WHERE sign = ? AND state = 'failed'", (sign,))
+                return
+            db.execute("DELETE FROM jobs WHERE sign = ?", (sign,))
+            db.execute("INSERT INTO jobs (kind, sign, digest, output, frame_start, frame_end, updated) "
+                       "VALUES ('render', ?, ?, ?, ?, ?, ?)",
+                       (sign, digest, output, frame_start, frame_end, time.time()))
+
+    def _requeue_expired(self, db, now):
+        expired = db.execute("SELECT id, attempts FROM jobs WHERE state = 'running' AND lease_until < ?",
+                             (now,)).fetchall()
+        for row in expired:
+            state = "failed" if row["attempts"] > self.retries else "pending"
+            db.execute("UPDATE jobs SET state = ?, worker = NULL, error = 'lease expired', updated = ? "
+                       "WHERE id = ?", (state, now, row["id"]))
+        return len(expired)
+
+    def _lease(self, db, job_id, worker, now):
+        db.execute("UPDATE jobs SET state = 'running', worker = ?, lease_until = ?, attempts = attempts + 1, "
+                   "updated = ? WHERE id = ?", (worker, now + LEASE_SECONDS, now, job_id))
+        db.execute("INSERT OR REPLACE INTO workers (name, heartbeat, job) VALUES (?, ?, ?)", (worker, now, job_id))
+        return dict(db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+
+    def claim(self, worker, signs=None):
+        """Lease the oldest pending job (of ``signs`` when given) to ``worker``, encodes first.
+
+        None when nothing is pending.
+        """
+        now = time.time()
+        where, params = sign_filter(signs)
+        with self.transaction() as db:
+            self._requeue_expired(db, now)
+            row = db.execute(f"SELECT id FROM jobs WHERE state = 'pending'{where} "
+                             f"ORDER BY kind = 'render', id LIMIT 1", params).fetchone()
+            return row and self._lease(db, row["id"], worker, now)
+
+    def steal(self, worker, signs=None, min_frames=MIN_STEAL_FRAMES):
+        """Split the running render (of ``signs`` when given) with the most frames left.
+
+        Its back half is leased to ``worker``.
+        """
+        now = time.time()
+        where, params = sign_filter(signs)
+        with self.transaction() as db:
+            left = "frame_end - COALESCE(progress, frame_start - 1)"
+            victim = db.execute(f"SELECT * FROM jobs WHERE state = 'running' AND kind = 'render'{where} "
+                                f"AND {left} >= ? ORDER BY {left} DESC LIMIT 1",
+                                (*params, 2 * min_frames)).fetchone()
+            if victim is None:
+                return None
+            done = victim["progress"] if victim["progress"] is not None else victim["frame_start"] - 1
+            split = done + (victim["frame_end"] - done) // 2
+            db.execute("UPDATE jobs SET frame_end = ?, updated = ? WHERE id = ?", (split, now, victim["id"]))
+            cursor = db.execute(
+                "INSERT INTO jobs (kind, sign, digest, output, frame_start, frame_end, updated) "
+                "VALUES ('render', ?, ?, ?, ?, ?, ?)",
+                (victim["sign"], victim["digest"], victim["output"], split + 1, victim["frame_end"], now))
+            return self._lease(db, cursor.lastrowid, worker, now)
+
+    def progress(self, job_id, frame):
+        """Record that the job's frames up to ``frame`` are done; returns the job's current last frame."""
+        with self.transaction() as db:
+            db.execute("UPDATE jobs SET progress = ?, lease_until = ?, updated = ? WHERE id = ?",
+                       (frame, time.time() + LEASE_SECONDS, time.time(), job_id))
+            return db.execute("SELECT frame_end FROM jobs WHERE id = ?", (job_id,)).fetchone()["frame_end"]
+
+    def heartbeat(self, worker):
+        """Extend the lease of ``worker``'s running job."""
+        now = time.time()
+        with self.transaction() as db:
+            db.execute("UPDATE workers SET heartbeat = ? WHERE name = ?", (now, worker))
+            db.execute("UPDATE jobs SET lease_until = ? WHERE worker = ? AND state = 'running'",
+                       (now + LEASE_SECONDS, worker))
+
+    def finish(self, job, seconds=None):
+        """Mark ``job`` done and return its final row; queue its sign's encode after the last render range."""
+        now = time.time()
+        with self.transaction() as db:
+            db.execute("UPDATE jobs SET state = 'done', lease_until = NULL, seconds = ?, updated = ? "
+                       "WHERE id = ?", (seconds, now, job["id"]))
+            if job["kind"] == "render":
+                unfinished = db.execute("SELECT COUNT(*) FROM jobs WHERE sign = ? AND kind = 'render' "
+                                        "AND state != 'done'", (job["sign"],)).fetchone()[0]
+                queued = db.execute("SELECT COUNT(*) FROM jobs WHERE sign = ? AND kind = 'encode'",
+                                    (job["sign"],)).fetchone()[0]
+                if not unfinished and not queued:
+                    db.execute("INSERT INTO jobs (kind, sign, digest, output, updated) "
+                               "VALUES ('encode', ?, ?, ?, ?)", (job["sign"], job["digest"], job["output"], now))
+            return dict(db.execute("SELECT * FROM jobs WHERE id = ?", (job["id"],)).fetchone())
+
+    def fail(self, job, error):
+        """Give ``job`` back for a retry, or mark it failed when its attempts are used up."""
+        with self.transaction() as db:
+            attempts = db.execute("SELECT attempts FROM jobs WHERE id = ?", (job["id"],)).fetchone()["attempts"]
+            state = "failed" if attempts > self.retries else "pending"
+            db.execute("UPDATE jobs SET state = ?, worker = NULL, lease_until = NULL, error = ?, updated = ? "
+                       "WHERE id = ?", (state, error, time.time(), job["id"]))
+            return state
+
+    def release(self, job):
+        """Give ``job`` back as pending without using up an attempt (its worker was stopped)."""
+        with self.transaction() as db:
+            db.execute("UPDATE jobs SET state = 'pending', worker = NULL, lease_until = NULL, "
+                       "attempts = MAX(attempts - 1, 0), updated = ? WHERE id = ?", (time.time(), job["id"]))
+
+    def sign_runtime(self, sign):
+        """Seconds spent on all of ``sign``'s render ranges."""
+        row = self.db.execute("SELECT SUM(seconds) FROM jobs WHERE sign = ? AND kind = 'render'",
+                              (sign,)).fetchone()
+        return row[0]
+
+    def unfinished(self, signs=None):
+        """Jobs still pending or running (for ``signs`` when given)."""
+        where, params = sign_filter(signs)
+        return self.db.execute(f"SELECT COUNT(*) FROM jobs WHERE state IN ('pending', 'running'){where}",
+                               params).fetchone()[0]
+
+    def failed_signs(self, signs=None):
+        rows = self.db.execute("SELECT DISTINCT sign FROM jobs WHERE state = 'failed' ORDER BY sign").fetchall()
+        return [row["sign"] for row in rows if signs is None or row["sign"] in signs]
+
+    def counts(self):
+        """``{state: jobs}`` over the whole table."""
+        return dict(self.db.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall())
+
+    def set_drain(self, drain=True):
+        """Ask every worker on this table to finish its current job and stop claiming new ones."""
+        self.db.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('drain', ?)", ("1" if drain else "0",))
+
+    def draining(self):
+        row = self.db.execute("SELECT value FROM settings WHERE key = 'drain'").fetchone()
+        return bool(row and row["value"] == "1")
+
+
+def sign_filter(signs):
+    """SQL condition and parameters restricting a query to ``signs`` (no restriction for None)."""
+    if signs is None:
+        return "", []
+    return f" AND sign IN ({','.join('?' * len(signs))})", list(signs)
+
+
+def worker_name(index):
+    return f"{socket.gethostname()}:{os.getpid()}:{index}"
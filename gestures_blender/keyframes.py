@@ -0,0 +1,53 @@
+"""
+Bulk keyframe writer for pose bones.
+
+``bone.keyframe_insert`` goes through the operator/RNA path once per key,
+which dominates setup for long sentences with thousands of keys. Here each
+fcurve is created once and its ``keyframe_points`` are filled in one
+``foreach_set`` call from NumPy arrays.
+"""
+import bpy
+import numpy as np
+
+ACTION_NAME = "SignAnimation"
+
+
+def new_action(obj, action_name=ACTION_NAME):
+    """Give ``obj`` a fresh, empty action (dropping the previous one of that name)."""
+    old = bpy.data.actions.get(action_name)
+    if old is not None:
+        bpy.data.actions.remove(old)
+    action = bpy.data.actions.new(action_name)
+    obj.animation_data_create()
+    obj.animation_data.action = action
+    return action
+
+
+def write_tracks(obj, tracks, data_path="rotation_euler", rotation_mode='XYZ',
+                 action_name=ACTION_NAME):
+    """Key pose bones from ``{bone: (frames (k,), values (k, channels))}``.
+
+    Frames must be sorted per bone. Bones missing from the armature are
+    skipped. Returns the number of keyframes written.
+    """
+    action = new_action(obj, action_name)
+    written = 0
+    for bone_name, (frames, values) in tracks.items():
+        if bone_name not in obj.pose.bones:
+            continue
+        obj.pose.bones[bone_name].rotation_mode = rotation_mode
+        frames = np.asarray(frames, dtype=np.float32)
+        values = np.asarray(values, dtype=np.float32).reshape(len(frames), -1)
+        path = f'pose.bones["{bone_name}"].{data_path}'
+
+        co = np.empty(2 * len(frames), dtype=np.float32)
+        co[0::2] = frames
+        for channel in range(values.shape[1]):
+            fcurve = action.fcurves.new(path, index=channel, action_group=bone_name)
+            fcurve.keyframe_points.add(len(frames))
+            co[1::2] = values[:, channel]
+            fcurve.keyframe_points.foreach_set("co", co)
+            # New points are Bezier with auto-clamped handles, like keyframe_insert
+            fcurve.update()
+            written += len(frames)
+    return written
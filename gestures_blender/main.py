@@ -1,18 +1,68 @@
+import argparse
+import functools
+import json
+import signal
 import subprocess
 import sys
 import os
+import shutil
 import string
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import build_cache
+import pose_compiler
+import verify_clips
+from image_sequence import encode_sequence, frames_dir_for, missing_frames, read_sequence_info
+from job_table import HEARTBEAT_INTERVAL, JobTable, worker_name
+from pose_library import BG_IMAGE, LIBRARY_PATH, ensure_library, load_library
+from render_client import DEFAULT_PORT, write_json
+from render_profiles import (
+    DEFAULT_PROFILE, LOD_LEVELS, LOD_MIN_HEIGHT, RENDER_PROFILES, clip_frames, output_size, parse_rates, rate_output,
+)
 
 # Path to your Blender executable
 BLENDER_PATH = "/Applications/Blender.app/Contents/MacOS/Blender"  # adjust if on Windows/Linux
 
 # Files
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 BLEND_FILE = "final_hello.blend"
-SCRIPTS_DIR = "/Users/shahnawajrangrej/Desktop/AI_Alliance/gestures_blender/ALPHABATES"
+SCRIPTS_DIR = os.path.join(BASE_DIR, "ALPHABATES")
+ANIMATOR = os.path.join(BASE_DIR, "animator.py")
+RENDER_WORKER = os.path.join(BASE_DIR, "render_worker.py")
+EXPORT_GLTF = os.path.join(BASE_DIR, "export_gltf.py")
+EXPORT_MATRICES = os.path.join(BASE_DIR, "export_matrices.py")
+# Modules animator.py renders through, hashed with it into every clip's digest
+RENDER_MODULES = (
+    "pose_compiler", "pose_library", "render_profiles", "keyframes", "interpolation", "image_sequence", "mesh_lod",
+)
+
+# Render pool defaults
+DEFAULT_RENDER_THREADS = 4       # Blender render threads per worker process
+DEFAULT_SIGN_TIMEOUT = 600       # seconds without a finished sign before a worker is killed
+DEFAULT_RETRIES = 2              # extra attempts for a sign whose render crashed or hung
+
+# Job table of --schedule runs, kept in the output directory
+SCHEDULE_NAME = "render_jobs.sqlite"
+SCHEDULE_POLL_INTERVAL = 2       # seconds an idle worker waits before looking for work again
+
+# Best workers x threads layout for this machine, written by --autotune
+LAYOUT_PATH = os.path.join(BASE_DIR, "render_layout.json")
+AUTOTUNE_SIGN = "a"
+# Signs each benchmark worker renders in its one Blender session: the
+# reference sign and the library signs after it (a repeated sign would find
+# its frames still on disk and skip the render)
+AUTOTUNE_SIGNS = 4
+
+# Printed by animator.py before / after each sign of a --batch run (keep in sync)
+START_PREFIX = "🎬 Rendering "
+DONE_PREFIX = "✅ Rendered "
 
-def run_gesture(script_file):
+def run_gesture(script_file, output_file=None):
     filename = os.path.basename(script_file)
-    output_file = f"{os.path.splitext(filename)[0]}.mp4"
+    output_file = output_file or f"{os.path.splitext(filename)[0]}.mp4"
 
     # Blender command
     cmd = [
@@ -26,11 +76,690 @@ def run_gesture(script_file):
     print("🚀 Running:", " ".join(cmd))
     subprocess.run(cmd, check=True)
 
-if __name__ == "__main__":
-    # Loop through A–Z
-    for letter in string.ascii_lowercase:  # 'a' to 'z'
+def animator_command(animator_argv, threads=None, script=ANIMATOR):
+    cmd = [BLENDER_PATH, "-b", BLEND_FILE]
+    if threads:
+        cmd += ["-t", str(threads)]
+    cmd += [
+        "--python-exit-code", "1",
+        "-P", script,
+        "--",
+        *animator_argv
+    ]
+    return cmd
+
+def serve(port=None, jobs_dir=None, threads=None):
+    """Run a persistent render_worker.py Blender (see render_client.py) until it is shut down."""
+    worker_argv = ["--jobs", os.path.abspath(jobs_dir)] if jobs_dir else ["--port", str(port)]
+    cmd = animator_command(worker_argv, threads, RENDER_WORKER)
+    print("🚀 Running:", " ".join(cmd))
+    return subprocess.run(cmd).returncode
+
+def batch_command(signs, output_dir, threads=None, animator_args=()):
+    return animator_command(["--batch", os.path.abspath(output_dir), *signs, *animator_args], threads)
+
+def run_batch(signs, output_dir=".", threads=None, timeout=None, on_done=None, animator_args=(),
+              on_start=None):
+    """Render signs in one Blender process (the blend file loads once).
+
+    Returns ``(exit_code, finished_signs, last_started_sign)``. The process is
+    killed when no sign finishes within ``timeout`` seconds.
+    """
+    cmd = batch_command(signs, output_dir, threads, animator_args)
+    print("🚀 Running:", " ".join(cmd))
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
+
+    watchdog = None
+    def arm_watchdog():
+        nonlocal watchdog
+        if watchdog:
+            watchdog.cancel()
+        if timeout:
+            watchdog = threading.Timer(timeout, proc.kill)
+            watchdog.daemon = True
+            watchdog.start()
+
+    finished = []
+    started = None
+    arm_watchdog()
+    try:
+        for line in proc.stdout:
+            if line.startswith(START_PREFIX):
+                started = line[len(START_PREFIX):].split()[0]
+                if on_start:
+                    on_start(started)
+            elif line.startswith(DONE_PREFIX):
+                # "✅ Rendered <sign> in <seconds>s"
+                fields = line[len(DONE_PREFIX):].split()
+                sign = fields[0]
+                seconds = float(fields[2].rstrip("s")) if len(fields) >= 3 else None
+                finished.append(sign)
+                arm_watchdog()
+                if on_done:
+                    on_done(sign, seconds)
+        proc.wait()
+    finally:
+        if watchdog:
+            watchdog.cancel()
+    return proc.returncode, finished, started
+
+def render_worker(signs, output_dir, threads, timeout, retries, on_done, animator_args=()):
+    """Render a share of the signs, retrying crashed/hung ones. Returns failed signs."""
+    remaining = list(signs)
+    attempts = {}
+    failed = []
+    while remaining:
+        code, finished, started = run_batch(remaining, output_dir, threads, timeout, on_done, animator_args)
+        remaining = [s for s in remaining if s not in finished]
+        if not remaining:
+            break
+        # Blender died (or hung) on the last sign it started; earlier unfinished
+        # signs were still encoding and resume from their frames on retry
+        culprit = started if started in remaining else remaining[0]
+        attempts[culprit] = attempts.get(culprit, 0) + 1
+        print(f"⚠️ Blender exited with {code} while rendering {culprit} (attempt {attempts[culprit]})")
+        if attempts[culprit] > retries:
+            failed.append(culprit)
+            remaining.remove(culprit)
+    return failed
+
+def default_workers(threads):
+    return max(1, (os.cpu_count() or 1) // threads)
+
+def render_pool(signs, output_dir=".", workers=None, threads=DEFAULT_RENDER_THREADS,
+                timeout=DEFAULT_SIGN_TIMEOUT, retries=DEFAULT_RETRIES, on_finished=None,
+                animator_args=()):
+    """Render signs with ``workers`` Blender processes at once.
+
+    A crash or hang only retries the affected sign; the rest keep going.
+    ``on_finished(sign, seconds)`` is called (under a lock) as each sign
+    completes. ``animator_args`` are passed on to animator.py. Returns the
+    signs that still failed after all retries.
+    """
+    if not signs:
+        return []
+    workers = max(1, min(workers or default_workers(threads), len(signs)))
+    shares = [signs[i::workers] for i in range(workers)]
+    print(f"🧵 {len(signs)} signs on {workers} workers x {threads} threads")
+
+    lock = threading.Lock()
+    progress = {"done": 0}
+    def on_done(sign, seconds):
+        with lock:
+            progress["done"] += 1
+            print(f"[{progress['done']}/{len(signs)}] ✅ {sign}")
+            if on_finished:
+                on_finished(sign, seconds)
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(render_worker, share, output_dir, threads, timeout, retries, on_done,
+                        animator_args)
+            for share in shares
+        ]
+        for future in as_completed(futures):
+            failed += future.result()
+    return failed
+
+def candidate_layouts(cores=None):
+    """(workers, threads) layouts that fill ``cores``: 1, 2, 4... threads each."""
+    cores = cores or os.cpu_count() or 1
+    layouts = []
+    threads = 1
+    while threads < cores:
+        layouts.append((cores // threads, threads))
+        threads *= 2
+    layouts.append((1, cores))
+    return layouts
+
+def benchmark_signs(lib, sign, count=AUTOTUNE_SIGNS):
+    """``sign`` and the ``count - 1`` library signs after it (wrapping around)."""
+    names = list(lib.names)
+    start = names.index(sign)
+    return [names[(start + i) % len(names)] for i in range(min(count, len(names)))]
+
+def benchmark_layout(workers, threads, signs, animator_args=(), timeout=DEFAULT_SIGN_TIMEOUT):
+    """Signs per minute with ``workers`` Blender processes of ``threads`` each rendering ``signs`` at once.
+
+    Every worker renders all of ``signs`` in one batch session and is timed
+    from its first sign starting, so Blender startup and the blend file load
+    are left out: the rate is the steady state of a long --batch run.
+    """
+    def run(output_dir):
+        times = {}
+        def on_start(sign):
+            times.setdefault("first", time.perf_counter())
+        def on_done(sign, seconds):
+            times["last"] = time.perf_counter()
+        code, finished, _ = run_batch(signs, output_dir, threads, timeout, on_done, animator_args, on_start)
+        if code != 0 or len(finished) < len(signs) or "first" not in times:
+            return None
+        return len(finished) * 60 / max(times["last"] - times["first"], 1e-6)
+
+    with tempfile.TemporaryDirectory(prefix="autotune-") as tmp_dir:
+        output_dirs = [os.path.join(tmp_dir, str(worker)) for worker in range(workers)]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            rates = list(pool.map(run, output_dirs))
+    if None in rates:
+        return 0.0
+    return sum(rates)
+
+def autotune(sign=AUTOTUNE_SIGN, animator_args=(), layouts=None, timeout=DEFAULT_SIGN_TIMEOUT,
+             path=LAYOUT_PATH):
+    """Benchmark ``layouts`` on this machine and save the fastest to ``path`` for later runs."""
+    lib = checked_library([sign])
+    signs = benchmark_signs(lib, sign)
+    results = []
+    for workers, threads in layouts or candidate_layouts():
+        rate = benchmark_layout(workers, threads, signs, animator_args, timeout)
+        print(f"⏱️ {workers} workers x {threads} threads: {rate:.1f} signs/min")
+        results.append({"workers": workers, "threads": threads, "signs_per_minute": round(rate, 2)})
+    best = max(results, key=lambda result: result["signs_per_minute"])
+    if not best["signs_per_minute"]:
+        print("❌ Every layout failed to render, nothing saved")
+        return None
+    layout = dict(best, cpu_count=os.cpu_count(), signs=signs, animator_args=list(animator_args), results=results)
+    write_json(path, layout)
+    print(f"✅ Best: {best['workers']} workers x {best['threads']} threads -> {path}")
+    return layout
+
+def saved_layout(path=LAYOUT_PATH):
+    """The --autotune layout, or None when there is none or it was tuned on a different core count."""
+    try:
+        with open(path) as f:
+            layout = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return layout if layout.get("cpu_count") == os.cpu_count() else None
+
+def run_shard(signs, frames_dir, shard, shard_count, threads, timeout, retries, animator_args=()):
+    cmd = animator_command([frames_dir, *signs, "--shard", f"{shard}/{shard_count}", *animator_args], threads)
+    for attempt in range(retries + 1):
+        print("🚀 Running:", " ".join(cmd))
+        try:
+            subprocess.run(cmd, check=True, timeout=timeout)
+            return True
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as err:
+            print(f"⚠️ Shard {shard}/{shard_count} failed (attempt {attempt + 1}): {err}")
+    return False
+
+def render_sharded(signs, output_file, shards=None, threads=DEFAULT_RENDER_THREADS,
+                   timeout=DEFAULT_SIGN_TIMEOUT, retries=DEFAULT_RETRIES, animator_args=()):
+    """Render ``signs`` back to back as one clip, splitting its frames across processes.
+
+    Each of ``shards`` Blender workers renders a contiguous frame range into a
+    shared PNG directory; the complete sequence is then encoded once, so the
+    join is lossless. Returns True when the clip was written.
+    """
+    checked_library(signs)
+    shards = shards or default_workers(threads)
+    output_file = os.path.abspath(output_file)
+    frames_dir = frames_dir_for(output_file)
+    os.makedirs(frames_dir, exist_ok=True)
+    print(f"🧩 {' '.join(signs)} -> {output_file} in {shards} shards x {threads} threads")
+
+    with ThreadPoolExecutor(max_workers=shards) as pool:
+        results = list(pool.map(
+            lambda shard: run_shard(signs, frames_dir, shard, shards, threads,
+                                    timeout and timeout * len(signs), retries, animator_args),
+            range(1, shards + 1),
+        ))
+    if not all(results):
+        print(f"❌ {results.count(False)} shards failed, frames kept in {frames_dir}")
+        return False
+
+    info = read_sequence_info(frames_dir)
+    missing = info and missing_frames(frames_dir, info["frame_start"], info["frame_end"])
+    if info is None or missing:
+        print(f"❌ Frames missing from {frames_dir}")
+        return False
+    encode_sequence(frames_dir, output_file, info["fps"], info["frame_start"])
+    shutil.rmtree(frames_dir, ignore_errors=True)
+    print(f"✅ {output_file}")
+    return True
+
+def run_scripts(letters, output_dir=".", force=False):
+    # One Blender launch per letter script (slow path, kept for comparison)
+    manifest = build_cache.load_manifest(output_dir)
+    shared = build_cache.settings_digest({"blend": BLEND_FILE, "background": BG_IMAGE})
+    for letter in letters:
         script_path = os.path.join(SCRIPTS_DIR, f"{letter}.py")
-        if os.path.exists(script_path):
-            run_gesture(script_path)
-        else:
-            print(f"⚠️ Script not found: {script_path}")
\ No newline at end of file
+        if not os.path.exists(script_path):
+            print(f"⚠️ Script not found: {script_path}")
+            continue
+        digest = build_cache.sign_digest(build_cache.file_digest(script_path), shared)
+        if not force and build_cache.is_fresh(manifest, letter, digest):
+            print(f"⏭️ {letter} is up to date")
+            continue
+        output_file = os.path.join(output_dir, f"{letter}.mp4")
+        started = time.perf_counter()
+        run_gesture(script_path, output_file)
+        build_cache.record(manifest, letter, digest, output_file, time.perf_counter() - started)
+        build_cache.save_manifest(output_dir, manifest)
+
+def checked_library(signs):
+    """Load the pose library and check ``signs`` without Blender; exit if any is broken."""
+    lib = load_library(ensure_library(LIBRARY_PATH))
+    missing = [s for s in signs if s not in lib]
+    if missing:
+        sys.exit(f"❌ Signs not in pose library: {' '.join(missing)}")
+    failures, warned = pose_compiler.check_signs(lib, signs)
+    for sign, messages in warned.items():
+        print(f"⚠️ {sign}: {'; '.join(messages)}")
+    if failures:
+        for sign, problems in failures.items():
+            print(f"❌ {sign}: {'; '.join(problems)}")
+        sys.exit(f"❌ {len(failures)} signs failed the pose check, nothing rendered")
+    return lib
+
+def animator_option(animator_args, option, default=None):
+    args = list(animator_args)
+    return args[args.index(option) + 1] if option in args else default
+
+def render_profile(animator_args=()):
+    """``(name, settings)`` of the render profile animator.py uses with ``animator_args``."""
+    name = animator_option(animator_args, "--profile") or (
+        "preview" if "--preview" in animator_args else DEFAULT_PROFILE)
+    profile = dict(RENDER_PROFILES[name])
+    profile["lod"] = animator_option(animator_args, "--lod", profile["lod"])
+    return name, profile
+
+def sign_digests(lib, signs, animator_args=()):
+    """Content hash of everything that goes into each sign's clip.
+
+    The render profile and timing are hashed as resolved settings, so editing
+    a preset invalidates the clips rendered with it.
+    """
+    shared = build_cache.settings_digest({
+        "blend": BLEND_FILE,
+        "background": BG_IMAGE,
+        "animator": ANIMATOR,
+        "animator_args": list(animator_args),
+        **{f"module:{name}": os.path.join(BASE_DIR, f"{name}.py") for name in RENDER_MODULES},
+        "profile": render_profile(animator_args)[1],
+        "timing": pose_compiler.timing_profile(animator_option(animator_args, "--timing")),
+        "sign_frames": list(pose_compiler.SIGN_FRAMES),
+        "lod_levels": [LOD_LEVELS, LOD_MIN_HEIGHT],
+    })
+    return {s: build_cache.sign_digest(build_cache.pose_digest(lib, s), shared) for s in signs}
+
+def expected_frames(animator_args=()):
+    """Frames in one sign's clip when animator.py runs with ``animator_args``."""
+    if "--rates" in animator_args:
+        return None  # depends on the blend file's frame rate; each rate is its own clip
+    return clip_frames(1, profile=render_profile(animator_args)[0],
+                       timing=animator_option(animator_args, "--timing"))
+
+def expected_resolution(animator_args=()):
+    """Width and height of the clips animator.py renders with ``animator_args``."""
+    return output_size(render_profile(animator_args)[1])
+
+def verify_rendered(signs, manifest, output_dir, frames, resolution=None):
+    """Probe the clips of ``signs`` in parallel, record the results and return the bad ones."""
+    clips = {s: (manifest[s]["output"], frames) for s in signs if s in manifest}
+    results = verify_clips.verify_clips(clips, resolution=resolution)
+    for sign, result in results.items():
+        build_cache.record_verification(manifest, sign, result)
+    build_cache.save_manifest(output_dir, manifest)
+    return verify_clips.report(results)
+
+def run_job(job, table_path, threads, timeout, animator_args=(), running=None):
+    """Run one job of the job table: a frame range in Blender, or an encode. Returns an error or None.
+
+    Blender and ffmpeg run in their own sessions, so Ctrl-C drains the
+    scheduler instead of killing them; each is kept in ``running`` while it
+    works, so it can be stopped from outside.
+    """
+    frames_dir = frames_dir_for(job["output"])
+    try:
+        if job["kind"] == "encode":
+            info = read_sequence_info(frames_dir)
+            missing = info and missing_frames(frames_dir, info["frame_start"], info["frame_end"])
+            if info is None or missing:
+                return f"frames missing from {frames_dir}"
+            proc = encode_sequence(frames_dir, job["output"], info["fps"], info["frame_start"], wait=False,
+                                   threads=threads, start_new_session=True)
+            wait_session(proc, timeout, running)
+            return None
+        cmd = animator_command([frames_dir, job["sign"], "--frames", f"{job['frame_start']}-{job['frame_end']}",
+                                "--job", table_path, str(job["id"]), *animator_args], threads)
+        print("🚀 Running:", " ".join(cmd))
+        wait_session(subprocess.Popen(cmd, start_new_session=True), timeout, running)
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as err:
+        return str(err)
+    return None
+
+def wait_session(proc, timeout, running=None):
+    """Wait for ``proc`` (started in its own session), listed in ``running`` meanwhile; raise if it fails."""
+    running = set() if running is None else running
+    running.add(proc)
+    try:
+        proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        kill_session(proc)
+        raise
+    finally:
+        running.discard(proc)
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, proc.args)
+
+def kill_session(proc):
+    """Kill ``proc`` and everything it started (it runs in its own session)."""
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    proc.wait()
+
+def job_label(job):
+    return "encode" if job["kind"] == "encode" else f"frames {job['frame_start']}-{job['frame_end']}"
+
+def schedule_worker(table_path, name, signs, threads, timeout, retries, animator_args, on_encoded,
+                    running=None, stopped=None, verify=None):
+    """Claim (or steal) and run jobs of ``signs`` until none are left or the table is draining.
+
+    Every encoded clip is checked with ``verify(path)`` (a verify_clips
+    result) when given; a bad clip fails its encode job, which keeps the
+    frames for the retry. Once ``stopped`` is set, a job whose Blender was
+    killed goes back to the table as it was and the worker quits.
+    """
+    table = JobTable(table_path, retries)
+    try:
+        while not table.draining():
+            job = table.claim(name, signs) or table.steal(name, signs)
+            if job is None:
+                if not table.unfinished(signs):
+                    break
+                time.sleep(SCHEDULE_POLL_INTERVAL)
+                continue
+            started = time.perf_counter()
+            error = run_job(job, table_path, threads, timeout, animator_args, running)
+            result = None
+            if not error and job["kind"] == "encode" and verify:
+                result = verify(job["output"])
+                if not result["ok"]:
+                    error = f"clip failed verification: {'; '.join(result['problems'])}"
+            if error and stopped is not None and stopped.is_set():
+                table.release(job)
+                break
+            if error:
+                state = table.fail(job, error)
+                print(f"⚠️ {job['sign']} {job_label(job)} {'failed for good' if state == 'failed' else 'requeued'}: "
+                      f"{error}")
+                continue
+            job = table.finish(job, time.perf_counter() - started)
+            print(f"✅ {job['sign']} {job_label(job)} ({name})")
+            if job["kind"] == "encode":
+                shutil.rmtree(frames_dir_for(job["output"]), ignore_errors=True)
+                on_encoded(job["sign"], job["output"], table.sign_runtime(job["sign"]), result)
+    finally:
+        table.close()
+
+def send_heartbeats(table_path, names, stop):
+    table = JobTable(table_path)
+    while not stop.wait(HEARTBEAT_INTERVAL):
+        for name in names:
+            table.heartbeat(name)
+    table.close()
+
+def render_scheduled(signs, output_dir=".", force=False, animator_args=(), workers=None,
+                     threads=DEFAULT_RENDER_THREADS, timeout=DEFAULT_SIGN_TIMEOUT, retries=DEFAULT_RETRIES):
+    """Render signs through the persistent job table in ``output_dir`` (see job_table.py).
+
+    Signs start as one whole-clip job each; idle workers steal half of the
+    longest running range, so the last signs of a run are split across every
+    worker instead of leaving them idle. Jobs survive restarts: running the
+    same command again resumes. Ctrl-C or SIGTERM (or ``--drain`` from
+    another shell) drains: running jobs finish, nothing new starts. A second
+    Ctrl-C kills the running renders, puts their jobs back and raises
+    KeyboardInterrupt. Every encoded clip is verified (verify_clips.py)
+    before it is recorded; a bad one is encoded again from its frames.
+    Returns ``(failed signs, drained)``.
+    """
+    digests = sign_digests(checked_library(signs), signs, animator_args)
+    manifest = build_cache.load_manifest(output_dir)
+    frames = expected_frames(animator_args)
+    frame_end = pose_compiler.SIGN_FRAMES[0] - 1 + frames
+    todo = [s for s in signs if force or not build_cache.is_fresh(manifest, s, digests[s])]
+    if len(todo) < len(signs):
+        print(f"⏭️ {len(signs) - len(todo)} signs up to date, {len(todo)} to render")
+    if not todo:
+        return [], False
+
+    os.makedirs(output_dir, exist_ok=True)
+    table_path = os.path.abspath(os.path.join(output_dir, SCHEDULE_NAME))
+    table = JobTable(table_path, retries)
+    table.set_drain(False)
+    for sign in todo:
+        table.add_sign(sign, digests[sign], os.path.abspath(os.path.join(output_dir, f"{sign}.mp4")),
+                       pose_compiler.SIGN_FRAMES[0], frame_end)
+    workers = max(1, workers or default_workers(threads))
+    names = [worker_name(i) for i in range(workers)]
+    print(f"🗂️ {len(todo)} signs in {table_path}: {table.counts()}, {workers} workers x {threads} threads")
+
+    lock = threading.Lock()
+    def on_encoded(sign, output_file, seconds, result=None):
+        if sign not in digests:
+            return  # left in the table by another run; its own run records it
+        with lock:
+            build_cache.record(manifest, sign, digests[sign], output_file, seconds, frames)
+            if result is not None:
+                build_cache.record_verification(manifest, sign, result)
+            build_cache.save_manifest(output_dir, manifest)
+
+    verify = None
+    if verify_clips.available():
+        resolution = expected_resolution(animator_args)
+        verify = functools.partial(verify_clips.verify_clip, expected_frames=frames, resolution=resolution)
+    else:
+        print(f"⚠️ {verify_clips.FFPROBE_PATH} not found, clips are not verified")
+
+    running = set()
+    stopped = threading.Event()
+    drained = False
+    def drain(signum, frame):
+        nonlocal drained
+        if drained:
+            # Second signal: kill the renders and encodes; their jobs go back to pending
+            print("🛑 Stopping: killing running renders and encodes")
+            stopped.set()
+            for proc in list(running):
+                kill_session(proc)
+            raise KeyboardInterrupt
+        drained = True
+        table.set_drain(True)
+        print("🛑 Draining: running jobs finish, nothing new starts (again to stop now)")
+    previous = {sig: signal.signal(sig, drain) for sig in (signal.SIGINT, signal.SIGTERM)}
+
+    stop = threading.Event()
+    heartbeat = threading.Thread(target=send_heartbeats, args=(table_path, names, stop), daemon=True)
+    heartbeat.start()
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        futures = [pool.submit(schedule_worker, table_path, name, todo, threads, timeout, retries,
+                               animator_args, on_encoded, running, stopped, verify) for name in names]
+        for future in futures:
+            future.result()
+    finally:
+        pool.shutdown(wait=not stopped.is_set(), cancel_futures=True)
+        stop.set()
+        for sig, handler in previous.items():
+            signal.signal(sig, handler)
+    drained = drained or table.draining()
+    failed = table.failed_signs(todo)
+    print(f"{'🛑' if drained else '🏁'} Job table: {table.counts()}")
+    table.close()
+    return failed, drained
+
+def render_incremental(signs, output_dir=".", force=False, animator_args=(), verify_all=False, **pool_args):
+    """Render only the signs whose inputs changed since their clip was made.
+
+    Every rendered clip is verified (see verify_clips.py); a bad clip is
+    rendered again, up to ``retries`` more rounds. With ``verify_all`` the
+    up-to-date clips are verified first too.
+    """
+    digests = sign_digests(checked_library(signs), signs, animator_args)
+    manifest = build_cache.load_manifest(output_dir)
+    frames = expected_frames(animator_args)
+    resolution = expected_resolution(animator_args)
+    verify = verify_clips.available()
+    if not verify:
+        print(f"⚠️ {verify_clips.FFPROBE_PATH} not found, clips are not verified")
+    elif verify_all and not force:
+        verify_rendered([s for s in signs if build_cache.is_fresh(manifest, s, digests[s])],
+                        manifest, output_dir, frames, resolution)
+    todo = [s for s in signs if force or not build_cache.is_fresh(manifest, s, digests[s])]
+    if len(todo) < len(signs):
+        print(f"⏭️ {len(signs) - len(todo)} signs up to date, {len(todo)} to render")
+
+    def on_finished(sign, seconds):
+        output_file = os.path.join(output_dir, f"{sign}.mp4")
+        if "--rates" in animator_args:
+            rates = parse_rates(animator_args[animator_args.index("--rates") + 1])
+            output_file = rate_output(output_file, max(rates))
+        build_cache.record(manifest, sign, digests[sign], output_file, seconds, frames)
+        build_cache.save_manifest(output_dir, manifest)
+
+    failed = []
+    for attempt in range(pool_args.get("retries", DEFAULT_RETRIES) + 1):
+        failed += render_pool(todo, output_dir, on_finished=on_finished,
+                              animator_args=animator_args, **pool_args)
+        if not verify:
+            break
+        todo = verify_rendered([s for s in todo if s not in failed], manifest, output_dir, frames, resolution)
+        if not todo or attempt == pool_args.get("retries", DEFAULT_RETRIES):
+            break
+        print(f"🔁 Re-rendering {len(todo)} clips that failed verification")
+    return failed + (todo if verify else [])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render sign clips with Blender")
+    parser.add_argument("signs", nargs="*", default=list(string.ascii_lowercase),
+                        help="signs to render (default: a-z)")
+    parser.add_argument("-o", "--output-dir", default=".", help="where <sign>.mp4 files go")
+    parser.add_argument("-j", "--workers", type=int,
+                        help="parallel Blender processes (default: the --autotune layout, else cores / threads)")
+    parser.add_argument("-t", "--threads", type=int,
+                        help=f"render threads per Blender process (default: the --autotune layout, "
+                             f"else {DEFAULT_RENDER_THREADS})")
+    parser.add_argument("--autotune", nargs="?", const=AUTOTUNE_SIGN, metavar="SIGN",
+                        help=f"time workers x threads layouts rendering SIGN (default {AUTOTUNE_SIGN}) "
+                             f"and save the fastest for later runs")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_SIGN_TIMEOUT,
+                        help="seconds per sign before a hung Blender is killed")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES,
+                        help="retries for a sign whose render crashed or hung")
+    parser.add_argument("--force", action="store_true",
+                        help="re-render even when the clip is up to date")
+    parser.add_argument("--verify", action="store_true",
+                        help="also probe clips that are up to date and re-render the bad ones")
+    parser.add_argument("--join", metavar="OUTPUT",
+                        help="render the signs back to back as one clip, sharding its frames")
+    parser.add_argument("--shards", type=int,
+                        help="frame-range shards for --join (default: cores / threads)")
+    parser.add_argument("--sentence", action="store_true",
+                        help="with --join, keep the arm raised and move straight between handshapes")
+    parser.add_argument("--direct", action="store_true",
+                        help="render every frame straight to FFMPEG instead of reusing static spans")
+    parser.add_argument("--preview", action="store_true",
+                        help="quick Workbench render at half size and frame rate, no background")
+    parser.add_argument("--profile", choices=sorted(RENDER_PROFILES),
+                        help="render profile: production, preview, or thumbnail (quarter size, low-detail avatar)")
+    parser.add_argument("--lod", choices=list(LOD_LEVELS),
+                        help="avatar mesh detail instead of the one picked from the output height")
+    parser.add_argument("--timing", choices=sorted(pose_compiler.TIMING_PROFILES),
+                        help="sign timing: drill (long hold), conversational (short), fingerspell (no raise/lower)")
+    parser.add_argument("--rates", metavar="FPS,FPS",
+                        help="also write <output-dir>/<fps>fps/<sign>.mp4 per rate, e.g. 60,30,24; "
+                             "rates dividing a higher one are selected from its frames, not rendered")
+    parser.add_argument("--schedule", action="store_true",
+                        help=f"render through a persistent job table ({SCHEDULE_NAME} in the output dir) "
+                             f"with leases, work stealing of frame ranges and resume after restarts")
+    parser.add_argument("--drain", action="store_true",
+                        help="ask a running --schedule on the output dir to finish its jobs and stop")
+    parser.add_argument("--serve", type=int, nargs="?", const=DEFAULT_PORT, metavar="PORT",
+                        help="start a persistent render worker for render_client.py jobs")
+    parser.add_argument("--jobs", metavar="DIR", help="with --serve, take jobs from DIR instead of a socket")
+    parser.add_argument("--gltf", metavar="OUTPUT",
+                        help="export the signs' animations as one .glb pack instead of rendering video")
+    parser.add_argument("--matrices", metavar="OUTPUT",
+                        help="export every frame's world bone matrices as a memory-mappable .npy + .json index")
+    parser.add_argument("--save-background", action="store_true",
+                        help="pack the background world and the avatar LOD meshes into the blend file once, "
+                             "so renders only reference them")
+    parser.add_argument("--per-script", action="store_true",
+                        help="launch Blender once per ALPHABATES/<letter>.py script")
+    args = parser.parse_args()
+    if args.sentence and not args.join:
+        parser.error("--sentence needs --join OUTPUT")
+    if args.rates and args.join:
+        parser.error("--rates renders per-sign clips, not --join")
+    if args.rates and args.direct:
+        parser.error("--rates selects frames from a PNG sequence, not --direct")
+    if args.schedule and (args.rates or args.direct or args.join):
+        parser.error("--schedule renders one PNG-sequence clip per sign: no --rates, --direct or --join")
+
+    animator_args = ["--preview"] if args.preview else []
+    animator_args += ["--timing", args.timing] if args.timing else []
+    animator_args += ["--profile", args.profile] if args.profile else []
+    animator_args += ["--lod", args.lod] if args.lod else []
+    if args.rates:
+        try:
+            parse_rates(args.rates)
+        except ValueError as err:
+            parser.error(str(err))
+        animator_args += ["--rates", args.rates]
+    if args.drain:
+        table_path = os.path.join(args.output_dir, SCHEDULE_NAME)
+        if not os.path.exists(table_path):
+            sys.exit(f"❌ No job table at {table_path}")
+        JobTable(table_path).set_drain(True)
+        print(f"🛑 Drain requested for {table_path}")
+        sys.exit(0)
+    if args.autotune:
+        sys.exit(0 if autotune(args.autotune, animator_args, timeout=args.timeout) else 1)
+    layout = saved_layout() if args.workers is None and args.threads is None else None
+    if layout:
+        print(f"🧵 Tuned layout: {layout['workers']} workers x {layout['threads']} threads ({LAYOUT_PATH})")
+        args.workers, args.threads = layout["workers"], layout["threads"]
+    args.threads = args.threads or DEFAULT_RENDER_THREADS
+    if args.gltf:
+        checked_library(args.signs)
+        cmd = animator_command([os.path.abspath(args.gltf), *args.signs], args.threads, EXPORT_GLTF)
+        print("🚀 Running:", " ".join(cmd))
+        sys.exit(subprocess.run(cmd).returncode)
+    elif args.matrices:
+        checked_library(args.signs)
+        cmd = animator_command([os.path.abspath(args.matrices), *args.signs,
+                                *(["--timing", args.timing] if args.timing else [])],
+                               args.threads, EXPORT_MATRICES)
+        print("🚀 Running:", " ".join(cmd))
+        sys.exit(subprocess.run(cmd).returncode)
+    elif args.save_background:
+        sys.exit(subprocess.run(animator_command(["--save-background"])).returncode)
+    elif args.serve or args.jobs:
+        sys.exit(serve(args.serve, args.jobs, args.threads))
+    elif args.join:
+        ok = render_sharded(args.signs, args.join, args.shards, args.threads, args.timeout, args.retries,
+                            animator_args + (["--sentence"] if args.sentence else []))
+        sys.exit(0 if ok else 1)
+    elif args.schedule:
+        try:
+            failed, drained = render_scheduled(args.signs, args.output_dir, args.force, animator_args,
+                                               args.workers, args.threads, args.timeout, args.retries)
+        except KeyboardInterrupt:
+            sys.exit("🛑 Stopped: run the same command again to resume")
+        if failed:
+            print(f"❌ Failed: {' '.join(failed)}")
+        sys.exit(1 if failed or drained else 0)
+    elif args.per_script:
+        run_scripts(args.signs, args.output_dir, args.force)
+    else:
+        animator_args += ["--direct"] if args.direct else []
+        failed = render_incremental(args.signs, args.output_dir, args.force, animator_args, args.verify,
+                                    workers=args.workers, threads=args.threads,
+                                    timeout=args.timeout, retries=args.retries)
+        if failed:
+            print(f"❌ Failed: {' '.join(failed)}")
+            sys.exit(1)
@@ -0,0 +1,109 @@
+"""
+Decimated avatar meshes for small renders (run inside Blender).
+
+The blend file ships one full-detail SMPL-X mesh. For each level of
+render_profiles.LOD_LEVELS below "full", a copy of it is decimated once per
+session (or once for good: animator.py --save-background stores every level
+in the blend file) and swapped in as the avatar's mesh data; "full" swaps
+the original back. The armature modifier and vertex groups stay on the
+object, so the lighter mesh is skinned and animated exactly like the full
+one.
+
+The decimation collapses edges in the rest pose. The hands are protected
+with a vertex group (every vertex mostly weighted to a wrist or finger bone),
+so they collapse last and keep about their level's "hands" share while the
+body takes the rest of the reduction. Shape keys are baked into the copy at
+their values in the blend file; signs do not animate them.
+"""
+import bpy
+
+from pose_compiler import HAND_BONES
+from render_profiles import LOD_LEVELS
+
+HAND_GROUP = "lod_hands"
+HAND_BONE_GROUPS = {bone.replace("right_", side) for side in ("left_", "right_") for bone in HAND_BONES}
+HAND_WEIGHT = 0.5           # a vertex this much weighted to hand bones is a hand vertex
+HAND_PROTECTION = 20.0      # Decimate vertex group factor: how much later hand edges collapse
+FULL_MESH_KEY = "lod_full_mesh"
+
+
+def avatar_meshes(armature):
+    """The mesh objects skinned to ``armature``."""
+    return [child for child in armature.children if child.type == 'MESH']
+
+
+def hand_group(mesh_obj):
+    """``mesh_obj``'s hand vertex group, built from its bone weights the first time."""
+    group = mesh_obj.vertex_groups.get(HAND_GROUP)
+    if group is None:
+        hand_indices = {g.index for g in mesh_obj.vertex_groups if g.name in HAND_BONE_GROUPS}
+        vertices = [v.index for v in mesh_obj.data.vertices
+                    if sum(g.weight for g in v.groups if g.group in hand_indices) >= HAND_WEIGHT]
+        group = mesh_obj.vertex_groups.new(name=HAND_GROUP)
+        group.add(vertices, 1.0, 'REPLACE')
+    return group
+
+
+def face_ratio(mesh, group, level):
+    """Decimate ratio that keeps ``level``'s share of body faces and about its share of hand faces."""
+    members = {v.index for v in mesh.vertices if any(g.group == group.index for g in v.groups)}
+    hand_faces = sum(all(i in members for i in poly.vertices) for poly in mesh.polygons)
+    hands = hand_faces / max(len(mesh.polygons), 1)
+    return (1 - hands) * LOD_LEVELS[level]["faces"] + hands * LOD_LEVELS[level]["hands"]
+
+
+def decimated_mesh(mesh_obj, full_mesh, level):
+    """``full_mesh`` decimated to ``level`` in the rest pose, reused while it matches."""
+    name = f"{full_mesh.name}.{level}"
+    mesh = bpy.data.meshes.get(name)
+    if mesh is not None and mesh.get("lod_source_faces") == len(full_mesh.polygons):
+        return mesh
+
+    mesh_obj.data = full_mesh  # decimate from full detail, not from another level
+    group = hand_group(mesh_obj)
+    skinning = [mod for mod in mesh_obj.modifiers if mod.type == 'ARMATURE' and mod.show_viewport]
+    for mod in skinning:
+        mod.show_viewport = False
+    decimate = mesh_obj.modifiers.new(name="LOD", type='DECIMATE')
+    try:
+        decimate.decimate_type = 'COLLAPSE'
+        decimate.ratio = face_ratio(full_mesh, group, level)
+        decimate.vertex_group = group.name
+        decimate.invert_vertex_group = True
+        decimate.vertex_group_factor = HAND_PROTECTION
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        lod = bpy.data.meshes.new_from_object(mesh_obj.evaluated_get(depsgraph),
+                                              preserve_all_data_layers=True, depsgraph=depsgraph)
+    finally:
+        mesh_obj.modifiers.remove(decimate)
+        for mod in skinning:
+            mod.show_viewport = True
+
+    if mesh is not None:
+        bpy.data.meshes.remove(mesh)
+    lod.name = name
+    lod["lod_source_faces"] = len(full_mesh.polygons)
+    lod.use_fake_user = True  # unused while another level renders, kept when the file is saved
+    print(f"🔻 {full_mesh.name} at {level}: {len(full_mesh.polygons)} -> {len(lod.polygons)} faces")
+    return lod
+
+
+def use_lod(armature, level):
+    """Swap the mesh data of ``armature``'s avatar meshes to ``level``; returns the level."""
+    for mesh_obj in avatar_meshes(armature):
+        full_name = mesh_obj.get(FULL_MESH_KEY)
+        if full_name is None:
+            full_name = mesh_obj[FULL_MESH_KEY] = mesh_obj.data.name
+        full_mesh = bpy.data.meshes[full_name]
+        target = full_mesh if level == "full" else decimated_mesh(mesh_obj, full_mesh, level)
+        if mesh_obj.data != target:
+            mesh_obj.data = target
+    return level
+
+
+def build_lods(armature):
+    """Decimate every level of ``armature``'s avatar meshes (for saving into the blend file)."""
+    for level in LOD_LEVELS:
+        if level != "full":
+            use_lod(armature, level)
+    return use_lod(armature, "full")
@@ -0,0 +1,372 @@
+"""
+Blender-free pose compiler and validator.
+
+Compiles sign definitions from the pose library into their full keyframe
+table (bone, path, channel, frame, value) with NumPy, and checks the result
+without launching Blender:
+
+  * every bone is an SMPL-X bone, values are finite and no channel is keyed
+    twice on one frame (euler angles beyond a full turn are reported as
+    warnings: they render, but the bone spins through an extra revolution);
+  * animator.py, run against fake_bpy, writes exactly the compiled keys;
+  * each gesture script, run against fake_bpy, poses the same as its library
+    entry.
+
+Every sign is compiled and animated in one back-to-back sequence, so a
+thousand signs check in about two seconds and main.py runs this as a gate
+before spending time on renders.
+
+Usage:
+    python pose_compiler.py            # every sign in the library
+    python pose_compiler.py a b hello
+"""
+import importlib
+import math
+import sys
+import time
+
+import numpy as np
+
+import fake_bpy
+from pose_library import LIBRARY_PATH, ensure_library, load_library, record_script, sign_scripts
+
+# Keyframes of one sign clip: rest, raised/hold start, hold end, back to rest
+SIGN_FRAMES = (1, 20, 60, 90)
+CLIP_LENGTH = SIGN_FRAMES[-1]
+
+# Sign timing in frames: arm raise, handshape hold, arm lower, and (sentences
+# only) the move from one handshape to the next. "standard" is the gesture
+# scripts' 1/20/60/90; a zero raise/lower leaves the arm up between clips.
+# fps None keeps the blend file's frame rate.
+TIMING_PROFILES = {
+    "standard": {"raise": 19, "hold": 40, "lower": 30, "transition": 10, "fps": None},
+    "drill": {"raise": 19, "hold": 80, "lower": 30, "transition": 10, "fps": None},
+    "conversational": {"raise": 8, "hold": 12, "lower": 10, "transition": 6, "fps": None},
+    "fingerspell": {"raise": 0, "hold": 12, "lower": 0, "transition": 6, "fps": None},
+    # Co-articulated sentences raise the arm once, hold each handshape, move
+    # straight to the next one and lower the arm once at the end
+    "sentence": {"raise": 19, "hold": 20, "lower": 30, "transition": 10, "fps": None},
+}
+DEFAULT_TIMING = "standard"
+DEFAULT_SENTENCE_TIMING = "sentence"
+
+KEY_DTYPE = np.dtype([
+    ("bone", "U32"),
+    ("path", "U24"),
+    ("channel", "i1"),
+    ("frame", "i4"),
+    ("value", "f4"),
+])
+
+# Euler components beyond a full turn are suspicious (degrees passed as radians,
+# or a key that makes the bone spin an extra revolution on its way)
+MAX_ANGLE = 2 * math.pi
+
+_SIDES = ("left", "right")
+_FINGERS = ("thumb", "index", "middle", "ring", "pinky")
+SMPLX_BONES = frozenset(
+    ["root", "pelvis", "spine1", "spine2", "spine3", "neck", "head", "jaw"]
+    + [f"{side}_{part}" for side in _SIDES for part in (
+        "hip", "knee", "ankle", "foot", "collar", "shoulder", "elbow", "wrist", "eye_smplhf")]
+    + [f"{side}_{finger}{joint}" for side in _SIDES for finger in _FINGERS for joint in (1, 2, 3)]
+)
+# The right (signing) hand: wrist and the 15 finger joints
+HAND_BONES = ["right_wrist"] + [f"right_{finger}{joint}" for finger in _FINGERS for joint in (1, 2, 3)]
+
+
+def timing_profile(timing=None, sentence=False):
+    """The TIMING_PROFILES entry for a name, a dict or None (the default for the mode)."""
+    if isinstance(timing, dict):
+        return timing
+    return TIMING_PROFILES[timing or (DEFAULT_SENTENCE_TIMING if sentence else DEFAULT_TIMING)]
+
+
+def clip_keys(timing):
+    """Keyed frames of one sign clip and which of them are rest poses.
+
+    Rest, hold start, hold end, rest; the rest keys are dropped when the
+    profile has no raise or no lower.
+    """
+    first = SIGN_FRAMES[0]
+    hold_start = first + timing["raise"]
+    frames = [first, hold_start, hold_start + timing["hold"], hold_start + timing["hold"] + timing["lower"]]
+    is_rest = [True, False, False, True]
+    keep = [timing["raise"] > 0, True, True, timing["lower"] > 0]
+    return (np.array([f for f, k in zip(frames, keep) if k]),
+            np.array([r for r, k in zip(is_rest, keep) if k]))
+
+
+def hold_keys(lib, signs, hold_starts, hold):
+    """Hold keys of ``signs`` starting at ``hold_starts`` (n,) and lasting ``hold`` frames.
+
+    Returns frames (n, h), poses (n, h, bones, 3) and which of the h slots
+    each sign uses (n, h): two for a held handshape, more for a sign that
+    moves during its hold (hello's wave).
+    """
+    frames = np.asarray(hold_starts)[:, None] + np.round(lib.hold_phase[signs] * hold).astype(int)
+    used = np.arange(lib.hold_phase.shape[1])[None, :] < lib.hold_count[signs][:, None]
+    return frames, lib.hold_euler[signs], used
+
+
+def sequence_tracks(lib, names, timing=None):
+    """Keyframes of ``names`` back to back as ``{bone: (frames (k,), eulers (k, 3))}``.
+
+    Every sign keys rest, its hold keys, rest (see clip_keys) offset by its slot.
+    """
+    timing = timing_profile(timing)
+    key_frames, is_rest = clip_keys(timing)
+    signs = np.array([lib.index[name] for name in names])
+    offsets = np.arange(len(names)) * (key_frames[-1] - SIGN_FRAMES[0] + 1)
+    before, after = key_frames[:int(is_rest[0])], key_frames[len(key_frames) - int(is_rest[-1]):]
+    hold_frames, hold, hold_used = hold_keys(lib, signs, offsets + key_frames[~is_rest][0], timing["hold"])
+    rest = lib.rest_euler[signs][:, None]                                        # (n, 1, bones, 3)
+    frames = np.concatenate([offsets[:, None] + before, hold_frames, offsets[:, None] + after], axis=1)  # (n, k)
+    values = np.concatenate([rest.repeat(len(before), 1), hold, rest.repeat(len(after), 1)], axis=1)
+    used = np.concatenate([np.ones((len(signs), len(before)), dtype=bool), hold_used,
+                           np.ones((len(signs), len(after)), dtype=bool)], axis=1)
+
+    tracks = {}
+    for b, bone in enumerate(lib.bones):
+        keyed = lib.mask[signs, b]
+        if keyed.any():
+            tracks[bone] = (frames[keyed][used[keyed]], values[keyed, :, b][used[keyed]])
+    return tracks
+
+
+def script_timing(lib, name):
+    """Timing profile that reproduces ``name``'s own gesture script (namaste holds 60 frames)."""
+    first, hold_start, hold_end, last = (int(f) for f in lib.script_frames[lib.index[name]])
+    return dict(TIMING_PROFILES[DEFAULT_TIMING],
+                **{"raise": hold_start - first, "hold": hold_end - hold_start, "lower": last - hold_end})
+
+
+def sequence_length(count, timing=None):
+    """Last frame of ``count`` signs animated back to back by sequence_tracks."""
+    key_frames, _ = clip_keys(timing_profile(timing))
+    return SIGN_FRAMES[0] - 1 + count * (key_frames[-1] - SIGN_FRAMES[0] + 1)
+
+
+def sentence_frames(count, timing=None):
+    """Keyed frames of a ``count``-sign sentence: rest, (hold start, hold end) per sign, rest."""
+    timing = timing_profile(timing, sentence=True)
+    first = SIGN_FRAMES[0]
+    hold_starts = first + timing["raise"] + np.arange(count) * (timing["hold"] + timing["transition"])
+    holds = np.stack([hold_starts, hold_starts + timing["hold"]], axis=1).ravel()
+    return np.concatenate([[first] if timing["raise"] else [], holds,
+                           [holds[-1] + timing["lower"]] if timing["lower"] else []]).astype(int)
+
+
+def sentence_length(count, timing=None):
+    """Last frame of a ``count``-sign sentence animated by sentence_tracks."""
+    return int(sentence_frames(count, timing)[-1])
+
+
+def sentence_tracks(lib, names, timing=None):
+    """Keyframes of ``names`` as one co-articulated sentence, ``{bone: (frames, eulers)}``.
+
+    The arm rises from the first sign's rest pose, holds each handshape (or
+    plays its hold keys),
+    interpolates directly into the next one over the profile's transition
+    and only returns to rest after the last sign. A bone one sign leaves
+    unkeyed sits at that sign's rest pose meanwhile.
+    """
+    timing = timing_profile(timing, sentence=True)
+    signs = np.array([lib.index[name] for name in names])
+    # Every other key after the optional rest is a hold start
+    hold_starts = sentence_frames(len(names), timing)[int(timing["raise"] > 0)::2][:len(names)]
+    hold_frames, hold, used = hold_keys(lib, signs, hold_starts, timing["hold"])
+    rest = lib.rest_euler[signs]                                                # (n, bones, 3)
+    hold = np.where(lib.mask[signs][:, None, :, None], hold, rest[:, None])     # (n, h, bones, 3)
+    frames = np.concatenate([[SIGN_FRAMES[0]] if timing["raise"] else [], hold_frames[used],
+                             [hold_frames[used][-1] + timing["lower"]] if timing["lower"] else []]).astype(int)
+    values = np.concatenate([rest[:1] if timing["raise"] else rest[:0], hold[used],
+                             rest[-1:] if timing["lower"] else rest[:0]])       # (k, bones, 3)
+
+    tracks = {}
+    for b, bone in enumerate(lib.bones):
+        if lib.mask[signs, b].any():
+            tracks[bone] = (frames, values[:, b])
+    return tracks
+
+
+def tracks_table(tracks, path="rotation_euler"):
+    """Flatten ``{bone: (frames, values)}`` into a KEY_DTYPE table."""
+    parts = []
+    for bone, (frames, values) in tracks.items():
+        frames = np.asarray(frames)
+        values = np.asarray(values).reshape(len(frames), -1)
+        channels = values.shape[1]
+        part = np.empty(len(frames) * channels, dtype=KEY_DTYPE)
+        part["bone"] = bone
+        part["path"] = path
+        part["channel"] = np.tile(np.arange(channels), len(frames))
+        part["frame"] = np.repeat(frames, channels)
+        part["value"] = values.ravel()
+        parts.append(part)
+    return sort_table(np.concatenate(parts) if parts else np.empty(0, dtype=KEY_DTYPE))
+
+
+def keys_table(keys):
+    """KEY_DTYPE table from ``(bone, path, channel, frame, value)`` tuples.
+
+    A later key on the same bone/channel/frame replaces the earlier one, as
+    with ``keyframe_insert``.
+    """
+    latest = {key[:4]: key for key in keys}
+    return sort_table(np.array(list(latest.values()), dtype=KEY_DTYPE))
+
+
+def sort_table(table):
+    return table[np.lexsort((table["frame"], table["channel"], table["path"], table["bone"]))]
+
+
+def compile_signs(lib, names, sentence=False, timing=None):
+    """Full keyframe table of ``names`` animated back to back (or as one sentence)."""
+    return tracks_table((sentence_tracks if sentence else sequence_tracks)(lib, names, timing))
+
+
+def compile_script(script_path):
+    """Keyframe table written by a gesture script, run against fake_bpy."""
+    return keys_table(record_script(script_path))
+
+
+def compile_animator(lib, names, sentence=False):
+    """Keyframe table animator.py actually writes for ``names``, run against fake_bpy."""
+    modules = ("animator", "keyframes", "mesh_lod")
+    with fake_bpy.installed() as bpy:
+        saved = {m: sys.modules.pop(m) for m in modules if m in sys.modules}
+        try:
+            animator = importlib.import_module("animator")
+            animator.animate(animator.setup_armature(), lib, names, sentence)
+        finally:
+            for m in modules:
+                sys.modules.pop(m, None)
+            sys.modules.update(saved)
+    return keys_table(fake_bpy.recorded_keys(bpy))
+
+
+def validate(table):
+    """Problems in a keyframe table, as readable strings (empty when valid)."""
+    problems = []
+    unknown = sorted(set(table["bone"]) - SMPLX_BONES)
+    if unknown:
+        problems.append(f"unknown bones: {', '.join(unknown)}")
+    bad = ~np.isfinite(table["value"])
+    if bad.any():
+        problems.append(f"{bad.sum()} non-finite values")
+    table = sort_table(table)
+    same_channel = (table["bone"][1:] == table["bone"][:-1]) & (table["path"][1:] == table["path"][:-1]) \
+        & (table["channel"][1:] == table["channel"][:-1])
+    duplicate = same_channel & (table["frame"][1:] == table["frame"][:-1])
+    if duplicate.any():
+        problems.append(f"{duplicate.sum()} channels keyed twice on one frame")
+    return problems
+
+
+def warnings(table):
+    """Suspicious but renderable keys, as readable strings."""
+    euler = table["path"] == "rotation_euler"
+    large = euler & (np.abs(table["value"]) > MAX_ANGLE)
+    if large.any():
+        bones = sorted(set(table["bone"][large]))
+        return [f"euler angles beyond a full turn on {', '.join(bones)}"]
+    return []
+
+
+def sample(table, frames):
+    """``{(bone, path, channel): values at frames}``; linear between keys, held outside."""
+    table = sort_table(table)
+    samples = {}
+    channel_keys = np.stack([table["bone"], table["path"], table["channel"].astype(str)], axis=1)
+    _, starts = np.unique(channel_keys, axis=0, return_index=True)
+    bounds = list(np.sort(starts)) + [len(table)]
+    for start, end in zip(bounds, bounds[1:]):
+        rows = table[start:end]
+        key = (str(rows["bone"][0]), str(rows["path"][0]), int(rows["channel"][0]))
+        samples[key] = np.interp(frames, rows["frame"], rows["value"])
+    return samples
+
+
+def compare(expected, actual, frames, atol=1e-5):
+    """Channels whose sampled values differ between two tables."""
+    want, got = sample(expected, frames), sample(actual, frames)
+    problems = []
+    for key in sorted(set(want) | set(got)):
+        if key not in want or key not in got:
+            problems.append(f"{key[0]}.{key[1]}[{key[2]}] only in {'actual' if key in got else 'expected'}")
+        elif not np.allclose(want[key], got[key], atol=atol):
+            problems.append(f"{key[0]}.{key[1]}[{key[2]}] differs")
+    return problems
+
+
+def same_keys(expected, actual, atol=1e-5):
+    """Whether two sorted tables key the same channels on the same frames with the same values."""
+    return (len(expected) == len(actual)
+            and all(np.array_equal(expected[f], actual[f]) for f in ("bone", "path", "channel", "frame"))
+            and np.allclose(expected["value"], actual["value"], atol=atol))
+
+
+def frame_window(table, first, last):
+    """Rows of ``table`` keyed on frames ``first``..``last``."""
+    return table[(table["frame"] >= first) & (table["frame"] <= last)]
+
+
+def check_signs(lib, names, scripts=None):
+    """Compile and check ``names``.
+
+    Returns ``(failures, warned)``, each ``{sign: [messages]}`` for the signs
+    concerned. Only failures should stop a render.
+    """
+    failures = {}
+    warned = {}
+    # Every sign back to back, checked against one animator.py run of the same
+    # sequence; only when something is off is each sign checked on its own slot
+    clip = sequence_length(1)
+    compiled = compile_signs(lib, names)
+    animated = compile_animator(lib, names)
+    clean = not validate(compiled) and same_keys(compiled, animated)
+    large = compiled[(compiled["path"] == "rotation_euler") & (np.abs(compiled["value"]) > MAX_ANGLE)]
+    large_slots = (large["frame"] - SIGN_FRAMES[0]) // clip
+    for s, name in enumerate(names):
+        problems = []
+        if s in large_slots:
+            warned[name] = warnings(large[large_slots == s])
+        if not clean:
+            first = SIGN_FRAMES[0] + s * clip
+            table = frame_window(compiled, first, first + clip - 1)
+            problems = validate(table)
+            problems += [f"animator: {p}" for p in compare(table, frame_window(animated, first, first + clip - 1),
+                                                           np.unique(table["frame"]))]
+        if scripts and name in scripts:
+            script_table = compile_script(scripts[name])
+            # Compiled at the script's own timing and compared up to the end of
+            # the hold: the generic clip always lowers to the rest pose, while
+            # hello's script leaves the wrist where the wave stopped
+            hold_end = int(lib.script_frames[lib.index[name]][2])
+            frames = np.unique(script_table["frame"][script_table["frame"] <= hold_end])
+            native = compile_signs(lib, [name], timing=script_timing(lib, name))
+            problems += [f"script: {p}" for p in compare(script_table, native, frames)]
+        if problems:
+            failures[name] = problems
+    return failures, warned
+
+
+if __name__ == "__main__":
+    lib = load_library(ensure_library(LIBRARY_PATH))
+    names = sys.argv[1:] or lib.names
+    missing = [name for name in names if name not in lib]
+    if missing:
+        sys.exit(f"❌ Signs not in pose library: {' '.join(missing)}")
+
+    started = time.perf_counter()
+    failures, warned = check_signs(lib, names, sign_scripts())
+    elapsed = (time.perf_counter() - started) * 1000
+    for name, messages in warned.items():
+        for message in messages:
+            print(f"⚠️ {name}: {message}")
+    for name, problems in failures.items():
+        for problem in problems:
+            print(f"❌ {name}: {problem}")
+    print(f"{'❌' if failures else '✅'} {len(names)} signs compiled and checked in {elapsed:.1f} ms, "
+          f"{len(failures)} failing")
+    sys.exit(1 if failures else 0)
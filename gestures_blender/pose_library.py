@@ -0,0 +1,216 @@
+"""
+Array-backed pose library built from the gesture scripts.
+
+Every ALPHABATES/<letter>.py script (plus hello.py and namaste.py) hard-codes
+its pose as Python literals and can only be read by running it inside Blender.
+This module runs each script once against the recording ``bpy`` stand-in in
+fake_bpy.py, collects the ``keyframe_insert`` calls and packs the result into
+one NumPy ``.npz`` file:
+
+    names       (signs,)            sign names, row order of every array below
+    bones       (bones,)            SMPL-X pose bone names
+    euler       (signs, bones, 3)   held pose, XYZ euler in radians
+    quat        (signs, bones, 4)   held pose as (w, x, y, z) quaternions
+    rest_euler  (signs, bones, 3)   pose at the first frame of the clip
+    mask        (signs, bones)      True where the sign keys that bone
+    hold_phase  (signs, keys)       hold keys as 0..1 of the hold (0 and 1 for a still handshape)
+    hold_euler  (signs, keys, bones, 3)  pose at each hold key (hello's wave)
+    hold_count  (signs,)            hold keys used per sign; the rest of each row is padding
+    script_frames (signs, 4)        the script's own rest, hold start, hold end and end frames
+
+Letters hold one handshape; word signs may move during the hold (hello
+waves the wrist) and key any bones of either arm and hand (namaste). Every
+bone any script keys is a library column, so both kinds go through the same
+animator, compiler and caches.
+
+Usage:
+    python pose_library.py                 # writes pose_library.npz
+    python pose_library.py out.npz
+"""
+import os
+import runpy
+import sys
+
+import numpy as np
+
+import fake_bpy
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.join(BASE_DIR, "ALPHABATES")
+WORD_SCRIPTS = [os.path.join(BASE_DIR, "hello.py"), os.path.join(BASE_DIR, "namaste.py")]
+LIBRARY_PATH = os.path.join(BASE_DIR, "pose_library.npz")
+BG_IMAGE = os.path.join(SCRIPTS_DIR, "public", "bg_blender.png")
+
+# Frames used by the gesture scripts: clip start and the held pose
+REST_FRAME = 1
+HOLD_FRAME = 20
+
+
+def record_script(script_path):
+    """Run a gesture script without Blender and return the keys it writes.
+
+    Each entry is ``(bone, data_path, channel, frame, value)``.
+    """
+    with fake_bpy.installed([script_path, "--", os.devnull]) as bpy:
+        runpy.run_path(script_path, run_name="__main__")
+    return fake_bpy.recorded_keys(bpy)
+
+
+def value_at(bone_keys, frame):
+    """Value of one bone's euler channel at ``frame``.
+
+    Keys are held constant outside the keyed range like Blender's fcurves.
+    Between keys the value is linearly interpolated, which matches Blender at
+    the keyed frames the library samples.
+    """
+    bone_keys = sorted(bone_keys)
+    if frame <= bone_keys[0][0]:
+        return bone_keys[0][1]
+    for (f0, v0), (f1, v1) in zip(bone_keys, bone_keys[1:]):
+        if f0 <= frame <= f1:
+            t = (frame - f0) / (f1 - f0)
+            return tuple(a + (b - a) * t for a, b in zip(v0, v1))
+    return bone_keys[-1][1]
+
+
+def euler_to_quat(euler):
+    """XYZ euler angles (radians, ``(..., 3)``) to ``(..., 4)`` (w, x, y, z) quaternions."""
+    half = np.asarray(euler, dtype=np.float64) * 0.5
+    cx, cy, cz = np.cos(half[..., 0]), np.cos(half[..., 1]), np.cos(half[..., 2])
+    sx, sy, sz = np.sin(half[..., 0]), np.sin(half[..., 1]), np.sin(half[..., 2])
+    return np.stack([
+        cx * cy * cz + sx * sy * sz,
+        sx * cy * cz - cx * sy * sz,
+        cx * sy * cz + sx * cy * sz,
+        cx * cy * sz - sx * sy * cz,
+    ], axis=-1)
+
+
+def sign_scripts():
+    """Map sign name -> script path for every letter and word script."""
+    scripts = {}
+    for filename in sorted(os.listdir(SCRIPTS_DIR)):
+        if filename.endswith(".py"):
+            scripts[os.path.splitext(filename)[0]] = os.path.join(SCRIPTS_DIR, filename)
+    for script_path in WORD_SCRIPTS:
+        scripts[os.path.splitext(os.path.basename(script_path))[0]] = script_path
+    return scripts
+
+
+def build_library(scripts=None):
+    """Extract every script into the library arrays (see module docstring)."""
+    scripts = scripts or sign_scripts()
+    recorded = {}
+    hold_frames = {}
+    script_frames = {}
+    for name, script_path in scripts.items():
+        per_bone = {}
+        for bone, data_path, channel, frame, value in record_script(script_path):
+            if data_path == "rotation_euler":
+                per_bone.setdefault(bone, {}).setdefault(frame, [0.0, 0.0, 0.0])[channel] = value
+        recorded[name] = {
+            bone: sorted((frame, tuple(value)) for frame, value in keys.items())
+            for bone, keys in per_bone.items()
+        }
+        # The hold runs from HOLD_FRAME to the last key before the return to rest
+        frames = sorted({frame for keys in per_bone.values() for frame in keys})
+        hold_end = frames[-2] if len(frames) > 2 else HOLD_FRAME
+        hold_frames[name] = [f for f in frames if HOLD_FRAME <= f <= hold_end] or [HOLD_FRAME]
+        script_frames[name] = (frames[0], HOLD_FRAME, hold_end, frames[-1])
+
+    names = list(recorded)
+    bones = sorted({bone for per_bone in recorded.values() for bone in per_bone})
+    bone_index = {bone: i for i, bone in enumerate(bones)}
+
+    euler = np.zeros((len(names), len(bones), 3), dtype=np.float32)
+    rest_euler = np.zeros_like(euler)
+    mask = np.zeros((len(names), len(bones)), dtype=bool)
+    hold_keys = max(len(frames) for frames in hold_frames.values())
+    hold_phase = np.ones((len(names), hold_keys), dtype=np.float32)
+    hold_euler = np.zeros((len(names), hold_keys, len(bones), 3), dtype=np.float32)
+    hold_count = np.array([len(hold_frames[name]) for name in names])
+    for s, name in enumerate(names):
+        first, last = hold_frames[name][0], hold_frames[name][-1]
+        for k, frame in enumerate(hold_frames[name]):
+            hold_phase[s, k] = (frame - first) / (last - first) if last > first else float(k)
+        for bone, bone_keys in recorded[name].items():
+            b = bone_index[bone]
+            euler[s, b] = value_at(bone_keys, HOLD_FRAME)
+            rest_euler[s, b] = value_at(bone_keys, REST_FRAME)
+            mask[s, b] = True
+            for k, frame in enumerate(hold_frames[name]):
+                hold_euler[s, k, b] = value_at(bone_keys, frame)
+        hold_euler[s, hold_count[s]:] = hold_euler[s, hold_count[s] - 1]
+
+    return {
+        "names": np.array(names),
+        "bones": np.array(bones),
+        "euler": euler,
+        "quat": euler_to_quat(euler).astype(np.float32),
+        "rest_euler": rest_euler,
+        "mask": mask,
+        "hold_phase": hold_phase,
+        "hold_euler": hold_euler,
+        "hold_count": hold_count,
+        "script_frames": np.array([script_frames[name] for name in names]),
+    }
+
+
+def save_library(arrays, path=LIBRARY_PATH):
+    # Uncompressed so members can be read straight from disk
+    np.savez(path, **arrays)
+    return path
+
+
+class PoseLibrary:
+    """All sign poses loaded from one .npz read, indexed by sign name."""
+
+    def __init__(self, arrays):
+        self.names = [str(n) for n in arrays["names"]]
+        self.bones = [str(b) for b in arrays["bones"]]
+        self.euler = arrays["euler"]
+        self.quat = arrays["quat"]
+        self.rest_euler = arrays["rest_euler"]
+        self.mask = arrays["mask"]
+        if "hold_euler" in arrays:
+            self.hold_phase = arrays["hold_phase"]
+            self.hold_euler = arrays["hold_euler"]
+            self.hold_count = arrays["hold_count"]
+            self.script_frames = arrays["script_frames"]
+        else:
+            # Libraries built before word signs: every sign holds one pose
+            self.hold_phase = np.tile(np.array([0.0, 1.0], dtype=np.float32), (len(self.names), 1))
+            self.hold_euler = np.stack([self.euler, self.euler], axis=1)
+            self.hold_count = np.full(len(self.names), 2)
+            self.script_frames = np.tile([REST_FRAME, HOLD_FRAME, 60, 90], (len(self.names), 1))
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.bone_index = {bone: i for i, bone in enumerate(self.bones)}
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __len__(self):
+        return len(self.names)
+
+
+def ensure_library(path=LIBRARY_PATH):
+    """Rebuild the library when it is missing or older than any gesture script."""
+    scripts = sign_scripts()
+    if os.path.exists(path):
+        built = os.path.getmtime(path)
+        if all(os.path.getmtime(p) <= built for p in scripts.values()):
+            return path
+    print(f"🔧 Rebuilding pose library {path}")
+    return save_library(build_library(scripts), path)
+
+
+def load_library(path=LIBRARY_PATH):
+    with np.load(path) as data:
+        return PoseLibrary({key: data[key] for key in data.files})
+
+
+if __name__ == "__main__":
+    output_path = sys.argv[1] if len(sys.argv) > 1 else LIBRARY_PATH
+    arrays = build_library()
+    save_library(arrays, output_path)
+    print(f"✅ Wrote {len(arrays['names'])} signs x {len(arrays['bones'])} bones to {output_path}")
@@ -0,0 +1,123 @@
+"""
+Client for render_worker.py (no bpy needed).
+
+    python render_client.py hi.mp4 h i --sentence --preview        # socket on the default port
+    python render_client.py hi.mp4 h i --jobs jobs/                # through a job directory
+    python render_client.py --shutdown
+
+From Python, keep a SocketClient open and call ``submit(make_job(...))`` per
+render; each reply arrives when that clip is written.
+"""
+import argparse
+import json
+import os
+import socket
+import sys
+import time
+import uuid
+
+# Shared with render_worker.py
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+JOB_SUFFIX = ".job"
+RESULT_SUFFIX = ".result.json"
+JOB_POLL_INTERVAL = 0.2          # seconds between job directory scans
+
+
+def make_job(signs, output, profile="production", sentence=False, easing=None, direct=False, timing=None):
+    return {
+        "id": uuid.uuid4().hex,
+        "signs": list(signs),
+        "output": os.path.abspath(output),
+        "profile": profile,
+        "timing": timing,
+        "sentence": sentence,
+        "easing": easing,
+        "direct": direct,
+    }
+
+
+def write_json(path, data):
+    """Write ``data`` so readers polling for ``path`` never see a partial file."""
+    tmp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.{os.getpid()}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+class SocketClient:
+    """Keeps one connection to a socket worker open across jobs."""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=None):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.stream = self.sock.makefile("rw", encoding="utf-8")
+
+    def submit(self, job):
+        """Send ``job`` and wait for its reply."""
+        self.stream.write(json.dumps(job) + "\n")
+        self.stream.flush()
+        line = self.stream.readline()
+        if not line:
+            raise ConnectionError("render worker closed the connection")
+        return json.loads(line)
+
+    def close(self):
+        self.stream.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def submit_file(job, jobs_dir, timeout=None):
+    """Drop ``job`` into a worker's job directory and wait for its result."""
+    job_id = job.setdefault("id", uuid.uuid4().hex)
+    write_json(os.path.join(jobs_dir, f"{job_id}{JOB_SUFFIX}"), job)
+
+    result_path = os.path.join(jobs_dir, f"{job_id}{RESULT_SUFFIX}")
+    deadline = timeout and time.monotonic() + timeout
+    while not os.path.exists(result_path):
+        if deadline and time.monotonic() > deadline:
+            raise TimeoutError(f"no result for job {job_id} after {timeout}s")
+        time.sleep(JOB_POLL_INTERVAL)
+    with open(result_path) as f:
+        reply = json.load(f)
+    os.remove(result_path)
+    return reply
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Send a render job to a running render_worker.py")
+    parser.add_argument("output", nargs="?", help="output .mp4")
+    parser.add_argument("signs", nargs="*", help="sign names from the pose library")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--jobs", metavar="DIR", help="the worker's job directory instead of the socket")
+    parser.add_argument("--preview", action="store_true", help="use the preview render profile")
+    parser.add_argument("--profile", help="render profile by name (production, preview, thumbnail)")
+    parser.add_argument("--sentence", action="store_true", help="animate the signs as one word")
+    parser.add_argument("--timing", help="sign timing profile (standard, drill, conversational, fingerspell)")
+    parser.add_argument("--easing", help="bake quaternion rotations with this easing")
+    parser.add_argument("--direct", action="store_true", help="render straight to FFMPEG")
+    parser.add_argument("--timeout", type=float, help="seconds to wait for the reply")
+    parser.add_argument("--shutdown", action="store_true", help="stop the worker")
+    args = parser.parse_args()
+
+    if args.shutdown:
+        job = {"id": uuid.uuid4().hex, "command": "shutdown"}
+    elif args.output and args.signs:
+        job = make_job(args.signs, args.output, args.profile or ("preview" if args.preview else "production"),
+                       args.sentence, args.easing, args.direct, args.timing)
+    else:
+        parser.error("give an output and at least one sign, or --shutdown")
+
+    if args.jobs:
+        reply = submit_file(job, args.jobs, args.timeout)
+    else:
+        with SocketClient(args.host, args.port, args.timeout) as client:
+            reply = client.submit(job)
+    print(json.dumps(reply))
+    sys.exit(0 if reply.get("ok") else 1)
@@ -0,0 +1,153 @@
+"""
+Render profiles shared by animator.py (inside Blender) and main.py.
+
+A profile fixes what a render looks like: engine, resolution, how many of
+the keyed frames are rendered and whether the world background is used.
+"production" matches the original gesture scripts; "preview" is for checking
+a handshape while editing; "thumbnail" is for small pickers and previews
+embedded in pages.
+
+The avatar mesh is decimated for small outputs (mesh_lod.py): a profile's
+"lod" names a level of LOD_LEVELS, or is None to pick it from the output's
+pixel height, so the same profile at a smaller resolution also gets the
+lighter mesh.
+"""
+import math
+import os
+
+from pose_compiler import (
+    DEFAULT_TIMING, SIGN_FRAMES, TIMING_PROFILES, sentence_length, sequence_length, timing_profile,
+)
+
+RENDER_PROFILES = {
+    "production": {
+        "engine": 'BLENDER_EEVEE_NEXT',
+        "resolution_percentage": 100,
+        "frame_step": 1,              # render every keyed frame at the blend file's fps
+        "background": True,
+        "lod": None,                  # from the output height: full at 1080p
+    },
+    "preview": {
+        "engine": 'BLENDER_WORKBENCH',
+        "resolution_percentage": 50,
+        "frame_step": 2,              # half the frames at half the fps, same duration
+        "background": False,
+        "lod": None,
+    },
+    "thumbnail": {
+        "engine": 'BLENDER_EEVEE_NEXT',
+        "resolution_percentage": 25,
+        "frame_step": 2,
+        "background": True,
+        "lod": None,
+    },
+}
+DEFAULT_PROFILE = "production"
+# Render size of final_hello.blend; profiles scale it by resolution_percentage
+BLEND_RESOLUTION = (1920, 1080)
+# Last frame of final_hello.blend's frame range. The gesture scripts never set
+# a range, so their clips (and merge_backend/clips) run to it: one
+# standard-timed sign holds its rest pose from frame 90 to here
+BLEND_FRAME_END = 100
+
+# Share of the avatar's faces kept per level; the hands keep a larger share
+# than the body, fingers are what a sign is read from
+LOD_LEVELS = {
+    "full": {"faces": 1.0, "hands": 1.0},
+    "medium": {"faces": 0.4, "hands": 0.8},
+    "low": {"faces": 0.15, "hands": 0.5},
+}
+# Smallest output height (pixels) each level is picked for, largest first
+LOD_MIN_HEIGHT = [(720, "full"), (360, "medium"), (0, "low")]
+
+
+def output_height(resolution_y, resolution_percentage=100):
+    """Pixel height of the rendered frames."""
+    return resolution_y * resolution_percentage // 100
+
+
+def output_size(profile, resolution=BLEND_RESOLUTION):
+    """``(width, height)`` of clips rendered with ``profile`` from a ``resolution`` scene."""
+    return tuple(output_height(side, profile["resolution_percentage"]) for side in resolution)
+
+
+def lod_for(profile, resolution_y, lod=None):
+    """LOD level for ``profile`` rendered from a ``resolution_y`` scene: ``lod``, the profile's, or by height."""
+    lod = lod or profile.get("lod")
+    if lod:
+        if lod not in LOD_LEVELS:
+            raise KeyError(f"Unknown LOD level {lod!r}, expected one of {', '.join(LOD_LEVELS)}")
+        return lod
+    height = output_height(resolution_y, profile["resolution_percentage"])
+    return next(level for min_height, level in LOD_MIN_HEIGHT if height >= min_height)
+
+
+def rate_plan(rates):
+    """Group output frame rates into ``[(rendered_rate, [rates selected from it]), ...]``.
+
+    A rate that evenly divides a higher requested rate is taken from that
+    render by keeping every n-th frame; only the others are rendered.
+    24, 30 and 60 fps render 60 (giving 30 too) and 24.
+    """
+    plan = []
+    for rate in sorted(set(rates), reverse=True):
+        for base, derived in plan:
+            if base % rate == 0:
+                derived.append(rate)
+                break
+        else:
+            plan.append((rate, []))
+    return plan
+
+
+def rate_frame_ends(frame_end, source_fps, base, derived):
+    """Last frame of the ``base`` fps render and, per rate, the last of its frames that rate's clip uses.
+
+    ``frame_end`` is the clip's last frame at ``source_fps``. Each rate's clip
+    has as many frames as a native render at that rate would
+    (stepped_end), so the render runs on until every derived rate's last
+    instant, frame_start + every * (frames - 1), is on disk. Returns
+    ``(render_end, {rate: last_frame})``, ``base`` included.
+    """
+    first = SIGN_FRAMES[0]
+    ends = {base: stepped_end(frame_end, source_fps / base)}
+    for rate in derived:
+        ends[rate] = first + base // rate * (stepped_end(frame_end, source_fps / rate) - first)
+    return max(ends.values()), ends
+
+
+def rate_output(output_path, rate):
+    """Where the ``rate`` fps version of ``output_path`` goes: ``<dir>/<rate>fps/<name>``."""
+    directory, filename = os.path.split(os.path.abspath(output_path))
+    return os.path.join(directory, f"{rate}fps", filename)
+
+
+def parse_rates(value):
+    """``"60,30,24"`` -> ``[60, 30, 24]``."""
+    rates = [int(rate) for rate in value.split(",") if rate.strip()]
+    if not rates or min(rates) <= 0:
+        raise ValueError(f"frame rates must be positive integers, got {value!r}")
+    return rates
+
+
+def stepped_end(frame_end, step):
+    """Last frame of an animation ending at ``frame_end`` once squeezed ``step`` times."""
+    return SIGN_FRAMES[0] + math.ceil((frame_end - SIGN_FRAMES[0]) / step)
+
+
+def clip_end(count, sentence=False, timing=None):
+    """Last frame (before any frame step) of the clip of ``count`` signs.
+
+    The animation's last key, except that one sign at the standard timing
+    runs to BLEND_FRAME_END like the gesture scripts' clips.
+    """
+    frame_end = sentence_length(count, timing) if sentence else sequence_length(count, timing)
+    if count == 1 and not sentence and timing_profile(timing) is TIMING_PROFILES[DEFAULT_TIMING]:
+        frame_end = max(frame_end, BLEND_FRAME_END)
+    return frame_end
+
+
+def clip_frames(count, sentence=False, profile=DEFAULT_PROFILE, timing=None):
+    """Frames in the clip of ``count`` signs rendered with ``profile`` and ``timing`` (names)."""
+    frame_end = clip_end(count, sentence, timing)
+    return stepped_end(frame_end, RENDER_PROFILES[profile]["frame_step"]) - SIGN_FRAMES[0] + 1
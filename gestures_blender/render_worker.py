@@ -0,0 +1,179 @@
+"""
+Persistent in-Blender render worker.
+
+Started once with final_hello.blend loaded, it takes JSON render jobs from a
+local TCP socket or a job directory and renders each one with the generic
+animator. Between jobs only the armature's animation is reset, so a job costs
+about its render time instead of a Blender launch plus blend file load.
+
+Usage:
+    blender -b final_hello.blend -P render_worker.py -- --port 8765
+    blender -b final_hello.blend -P render_worker.py -- --jobs jobs/
+
+Socket jobs are one JSON object per line; every job gets one JSON reply line.
+Directory jobs are ``<id>.job`` files (write them elsewhere and rename into
+place); the reply is written next to them as ``<id>.result.json``. Several
+workers can watch one directory: each job is claimed by renaming it first.
+
+    job:   {"id": 1, "signs": ["h", "i"], "output": "/abs/hi.mp4",
+            "profile": "preview", "timing": "fingerspell", "sentence": true, "easing": null,
+            "direct": false}
+    reply: {"id": 1, "ok": true, "output": "/abs/hi.mp4", "frames": 70, "seconds": 3.21}
+           {"id": 1, "ok": false, "error": "KeyError: ..."}
+
+``{"command": "shutdown"}`` stops the worker. render_client.py submits jobs.
+"""
+import argparse
+import glob
+import json
+import os
+import socket
+import sys
+import time
+import traceback
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import animator  # noqa: E402
+from pose_library import BG_IMAGE, LIBRARY_PATH, load_library  # noqa: E402
+from render_client import (  # noqa: E402
+    DEFAULT_HOST, DEFAULT_PORT, JOB_POLL_INTERVAL, JOB_SUFFIX, RESULT_SUFFIX, write_json,
+)
+
+
+class RenderWorker:
+    """Blender state kept between jobs: armature, its initial pose and the pose library."""
+
+    def __init__(self, library_path=LIBRARY_PATH):
+        self.library_path = library_path
+        self.lib = None
+        self.lib_mtime = None
+        self.obj = animator.setup_armature()
+        self.initial_pose = animator.snapshot_pose(self.obj)
+        self.background = False
+
+    def library(self):
+        # Pick up a rebuilt pose_library.npz without restarting Blender
+        mtime = os.path.getmtime(self.library_path)
+        if mtime != self.lib_mtime:
+            self.lib, self.lib_mtime = load_library(self.library_path), mtime
+        return self.lib
+
+    def run(self, job):
+        started = time.perf_counter()
+        lib = self.library()
+        names = list(job["signs"])
+        output_path = os.path.abspath(job["output"])
+        profile = animator.RENDER_PROFILES[job.get("profile", animator.DEFAULT_PROFILE)]
+        direct = job.get("direct", False)
+        animator.check_signs(lib, names)
+
+        animator.restore_pose(self.obj, self.initial_pose)
+        frame_end = animator.animate(self.obj, lib, names, job.get("sentence", False), job.get("easing"),
+                                     profile["frame_step"], job.get("timing"))
+        animator.configure_render(output_path, direct, profile)
+        if profile["background"] and not self.background:
+            # Only referenced after the first time; Workbench ignores the world nodes anyway
+            animator.set_world_background(BG_IMAGE)
+            self.background = True
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        animator.render_clip(output_path, direct)
+        return {"output": output_path, "frames": frame_end,
+                "seconds": round(time.perf_counter() - started, 3)}
+
+    def handle(self, job):
+        """Run one job and return its reply; a failing job never stops the worker."""
+        reply = {"id": job.get("id")}
+        try:
+            reply.update(ok=True, **self.run(job))
+            print(f"✅ Job {reply['id']}: {' '.join(job['signs'])} in {reply['seconds']:.2f}s", flush=True)
+        except Exception as err:
+            traceback.print_exc()
+            reply.update(ok=False, error=f"{type(err).__name__}: {err}")
+            print(f"❌ Job {reply['id']}: {reply['error']}", flush=True)
+        return reply
+
+
+def parse_job(text):
+    try:
+        job = json.loads(text)
+    except json.JSONDecodeError as err:
+        return None, {"ok": False, "error": f"bad job JSON: {err}"}
+    if not isinstance(job, dict):
+        return None, {"ok": False, "error": "job must be a JSON object"}
+    return job, None
+
+
+def serve_socket(worker, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Serve jobs from one client connection at a time until a shutdown command."""
+    with socket.create_server((host, port)) as server:
+        print(f"👂 Render worker listening on {host}:{port}", flush=True)
+        while True:
+            conn, _ = server.accept()
+            with conn, conn.makefile("rw", encoding="utf-8") as stream:
+                for line in stream:
+                    if not line.strip():
+                        continue
+                    job, reply = parse_job(line)
+                    shutdown = job is not None and job.get("command") == "shutdown"
+                    if shutdown:
+                        reply = {"id": job.get("id"), "ok": True}
+                    elif job is not None:
+                        reply = worker.handle(job)
+                    stream.write(json.dumps(reply) + "\n")
+                    stream.flush()
+                    if shutdown:
+                        return
+
+
+def job_age(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0.0
+
+
+def serve_directory(worker, jobs_dir):
+    """Run ``<id>.job`` files from ``jobs_dir`` oldest first until a shutdown job."""
+    os.makedirs(jobs_dir, exist_ok=True)
+    print(f"👂 Render worker watching {jobs_dir}", flush=True)
+    while True:
+        paths = glob.glob(os.path.join(jobs_dir, f"*{JOB_SUFFIX}"))
+        if not paths:
+            time.sleep(JOB_POLL_INTERVAL)
+            continue
+        for path in sorted(paths, key=job_age):
+            claimed = f"{path}.{os.getpid()}"
+            try:
+                os.rename(path, claimed)
+            except FileNotFoundError:
+                continue  # another worker took it
+            with open(claimed) as f:
+                job, reply = parse_job(f.read())
+            os.remove(claimed)
+            shutdown = job is not None and job.get("command") == "shutdown"
+            if shutdown:
+                reply = {"id": job.get("id"), "ok": True}
+            elif job is not None:
+                reply = worker.handle(job)
+            write_json(path[:-len(JOB_SUFFIX)] + RESULT_SUFFIX, reply)
+            if shutdown:
+                return
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="blender -b final_hello.blend -P render_worker.py --")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="interface to listen on (keep it local)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="TCP port for JSON jobs")
+    parser.add_argument("--jobs", metavar="DIR", help="watch DIR for <id>.job files instead of a socket")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    argv = sys.argv
+    argv = argv[argv.index("--") + 1:] if "--" in argv else []  # get args after '--'
+    args = parse_args(argv)
+    worker = RenderWorker()
+    if args.jobs:
+        serve_directory(worker, os.path.abspath(args.jobs))
+    else:
+        serve_socket(worker, args.host, args.port)
@@ -0,0 +1,156 @@
+"""
+Verification of rendered sign clips (no bpy needed).
+
+A Blender exit code of 0 does not prove the MP4 is usable: an empty,
+truncated or wrong-length clip only shows up when the backend concatenates
+clips. Every clip is probed with ffprobe (stream codec, resolution, frame
+rate, duration, packet count) and its first and last frames are decoded with
+ffmpeg, then checked against the frame count the sign should have. Probes
+run in parallel since they are I/O and subprocess bound.
+
+Usage:
+    python verify_clips.py clips/             # every clip in clips/render_manifest.json
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import build_cache
+from image_sequence import FFMPEG_PATH
+
+FFPROBE_PATH = os.environ.get("FFPROBE_PATH", "ffprobe")
+EXPECTED_CODECS = ("h264", "mpeg4")
+# Allowed |duration - frames / fps| in frames, for container rounding
+DURATION_TOLERANCE_FRAMES = 1.5
+DEFAULT_PROBE_WORKERS = 8
+
+
+def available():
+    """True when both ffprobe and ffmpeg can be run."""
+    return bool(shutil.which(FFPROBE_PATH) and shutil.which(FFMPEG_PATH))
+
+
+def probe_clip(path, ffprobe=FFPROBE_PATH):
+    """Facts about the first video stream of ``path`` (None values where unknown)."""
+    cmd = [
+        ffprobe, "-v", "error", "-select_streams", "v:0", "-count_packets",
+        "-show_entries", "stream=codec_name,width,height,avg_frame_rate,nb_read_packets,duration"
+                         ":format=duration",
+        "-of", "json", path,
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        return {"error": result.stderr.strip() or f"ffprobe exited with {result.returncode}"}
+    data = json.loads(result.stdout or "{}")
+    streams = data.get("streams") or [{}]
+    stream = streams[0]
+    num, _, den = (stream.get("avg_frame_rate") or "0/1").partition("/")
+    fps = float(num) / float(den) if den and float(den) else 0.0
+    duration = stream.get("duration") or data.get("format", {}).get("duration")
+    return {
+        "codec": stream.get("codec_name"),
+        "width": stream.get("width"),
+        "height": stream.get("height"),
+        "fps": fps,
+        "frames": int(stream["nb_read_packets"]) if stream.get("nb_read_packets") else None,
+        "duration": float(duration) if duration else None,
+    }
+
+
+def decodes(path, last=False, ffmpeg=FFMPEG_PATH):
+    """True when ffmpeg decodes the first (or the last) frame of ``path`` without errors."""
+    cmd = [ffmpeg, "-v", "error"]
+    if last:
+        cmd += ["-sseof", "-0.5"]
+    cmd += ["-i", path, "-map", "0:v:0"]
+    if not last:
+        cmd += ["-frames:v", "1"]
+    cmd += ["-f", "null", "-"]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    return result.returncode == 0 and not result.stderr.strip()
+
+
+def check_probe(probe, expected_frames=None, resolution=None):
+    """Problems with a probed clip, as readable strings (empty when it is good)."""
+    if "error" in probe:
+        return [probe["error"]]
+    problems = []
+    if probe["codec"] not in EXPECTED_CODECS:
+        problems.append(f"codec {probe['codec']}, expected one of {', '.join(EXPECTED_CODECS)}")
+    if not probe["width"] or not probe["height"]:
+        problems.append("no video size")
+    elif resolution and (probe["width"], probe["height"]) != tuple(resolution):
+        problems.append(f"{probe['width']}x{probe['height']}, expected {resolution[0]}x{resolution[1]}")
+    if not probe["frames"]:
+        problems.append("no frames")
+    elif expected_frames and probe["frames"] != expected_frames:
+        problems.append(f"{probe['frames']} frames, expected {expected_frames}")
+    if probe["frames"] and probe["fps"] and probe["duration"] is not None:
+        drift = abs(probe["duration"] * probe["fps"] - probe["frames"])
+        if drift > DURATION_TOLERANCE_FRAMES:
+            problems.append(f"duration {probe['duration']:.3f}s does not fit {probe['frames']} frames")
+    return problems
+
+
+def verify_clip(path, expected_frames=None, resolution=None):
+    """Probe, decode and check one clip: ``{"ok", "problems", **probe}``."""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return {"ok": False, "problems": ["missing or empty file"]}
+    probe = probe_clip(path)
+    problems = check_probe(probe, expected_frames, resolution)
+    if not problems:
+        if not decodes(path):
+            problems.append("first frame does not decode")
+        if not decodes(path, last=True):
+            problems.append("last frame does not decode")
+    return {"ok": not problems, "problems": problems, **probe}
+
+
+def verify_clips(clips, workers=DEFAULT_PROBE_WORKERS, resolution=None):
+    """Verify ``{sign: (path, expected_frames)}`` in parallel; returns ``{sign: result}``.
+
+    Clips must be ``resolution`` (width, height) when given. All clips of one
+    run should share a resolution, so a clip that differs from the most
+    common size is flagged too.
+    """
+    if not clips:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(clips)))) as pool:
+        futures = {sign: pool.submit(verify_clip, path, frames, resolution)
+                   for sign, (path, frames) in clips.items()}
+        results = {sign: future.result() for sign, future in futures.items()}
+
+    sizes = Counter((r["width"], r["height"]) for r in results.values() if r.get("width"))
+    if len(sizes) > 1:
+        common = sizes.most_common(1)[0][0]
+        for result in results.values():
+            if result.get("width") and (result["width"], result["height"]) != common:
+                result["problems"].append(f"{result['width']}x{result['height']}, others are {common[0]}x{common[1]}")
+                result["ok"] = False
+    return results
+
+
+def report(results):
+    """Print one line per bad clip and a summary; returns the failing signs."""
+    failed = [sign for sign, result in results.items() if not result["ok"]]
+    for sign in failed:
+        print(f"❌ {sign}: {'; '.join(results[sign]['problems'])}")
+    print(f"{'❌' if failed else '✅'} {len(results)} clips verified, {len(failed)} bad")
+    return failed
+
+
+if __name__ == "__main__":
+    if not available():
+        sys.exit(f"❌ {FFPROBE_PATH} / {FFMPEG_PATH} not found (set FFPROBE_PATH / FFMPEG_PATH)")
+    output_dir = sys.argv[1] if len(sys.argv) > 1 else "."
+    manifest = build_cache.load_manifest(output_dir)
+    clips = {sign: (entry["output"], entry.get("frames")) for sign, entry in manifest.items()}
+    results = verify_clips(clips)
+    for sign, result in results.items():
+        build_cache.record_verification(manifest, sign, result)
+    build_cache.save_manifest(output_dir, manifest)
+    sys.exit(1 if report(results) else 0)